@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Compression de texte par l'algorithme de Huffman, en trois variantes :
+
+- "statique"  : dictionnaire de fréquences fixe connu à l'avance
+- "classique" : arbre construit à partir du texte et inclus dans le fichier compressé
+- "adaptatif" : arbre construit en temps réel au fil du flux
+
+ainsi qu'un codeur rANS ("rans") qui réutilise les modèles statique et appris sur le texte.
+
+Les données compressées sont une suite de trames, chacune précédée d'un en-tête (voir huffman.conteneur)
+qui permet à decompress de retrouver le mode utilisé ; des trames mises bout à bout (ajouter_fichier)
+se décompressent en un seul texte. Les codecs ne sont importés qu'à leur premier usage.
+Avec mode="auto", le mode est choisi d'après un échantillon de l'entrée (voir huffman.auto).
+
+    >>> import huffman
+    >>> donnees = huffman.compress("le horla", mode="classique")
+    >>> huffman.decompress(donnees)
+    'le horla'
+"""
+
+import importlib
+import io
+import os
+
+from .blocs import ouvrir_carte, ouvrir_sortie, ouvrir_vue
+from .conteneur import MODES, TAILLE_ENTETE, ErreurFormat, ecrire_trame, est_trame, lire_entete
+
+__all__ = [
+    "MODES",
+    "ErreurFormat",
+    "compress",
+    "decompress",
+    "compresser_fichier",
+    "ajouter_fichier",
+    "decompresser_fichier",
+    "detecter_mode",
+    "choisir_mode",
+]
+
+
+def _codec(mode):
+    """Importe (une seule fois) le module du codec correspondant au mode."""
+    if mode not in MODES:
+        raise ValueError(f"mode inconnu : {mode!r} (modes possibles : {', '.join(MODES)})")
+    return importlib.import_module(f".{mode}", __name__)
+
+
+def _decompresser(donnees, mode, chemin_entree=None, **options):
+    """
+    Décompresse les trames mises bout à bout (ou, à défaut d'en-tête, des données brutes du mode donné),
+    en produisant le texte morceau par morceau
+    """
+    if len(donnees) == 0:
+        return
+    if not est_trame(donnees):
+        if mode is None:
+            raise ErreurFormat("en-tête absent : précisez le mode pour lire d'anciennes données sans en-tête")
+        # fichier produit par une ancienne version, sans en-tête
+        emplacement = (chemin_entree, 0, len(donnees)) if chemin_entree is not None else None
+        yield from _codec(mode).decompresser_donnees(donnees, emplacement, **options)
+        return
+
+    position = 0
+    arbre = None  # arbre de la dernière trame classique, qu'une trame suivante peut réutiliser
+    while position < len(donnees):
+        mode, debut, fin = lire_entete(donnees, position)
+        codec = _codec(mode)
+        emplacement = (chemin_entree, debut, fin) if chemin_entree is not None else None
+        if mode == "classique":
+            yield from codec.decompresser_donnees(donnees[debut:fin], emplacement, arbre_precedent=arbre, **options)
+            arbre = codec.arbre_trame(donnees[debut:fin], arbre)
+        else:
+            yield from codec.decompresser_donnees(donnees[debut:fin], emplacement, **options)
+        position = fin
+
+
+def _arbre_precedent(donnees):
+    """
+    Arbre de la dernière trame classique de données compressées, None s'il n'y en a pas
+    Seuls les en-têtes des trames et l'arbre retenu sont lus
+    """
+    trames_classiques = []
+    position = 0
+    while position < len(donnees):
+        mode, debut, fin = lire_entete(donnees, position)
+        if mode == "classique":
+            trames_classiques.append((debut, fin))
+        position = fin
+
+    classique = _codec("classique")
+    for debut, fin in reversed(trames_classiques):
+        # une trame vide ou qui réutilise l'arbre précédent renvoie à la trame classique d'avant
+        arbre = classique.arbre_trame(donnees[debut:fin])
+        if arbre is not None:
+            return arbre
+    return None
+
+
+def _mode_auto(donnees, mode, options):
+    """Remplace mode="auto" par le mode choisi sur un échantillon ; retourne (mode, décision)."""
+    if mode != "auto":
+        return mode, None
+    budget = options.pop("budget", None)
+    if options:
+        raise ValueError(f"options sans effet en mode auto : {', '.join(options)}")
+    decision = choisir_mode(donnees, budget)
+    return decision["mode"], decision
+
+
+def compress(data, mode="classique", **options) -> bytes:
+    """
+    Compresse un texte (str, ou bytes encodés en UTF-8) et retourne une trame avec en-tête
+    Les options dépendent du mode : mots, seuil, flux (classique) ;
+    politique, parametre, intervalle (adaptatif) ; modele, etats (rans) ; budget (auto)
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    mode, _ = _mode_auto(data, mode, options)
+    codec = _codec(mode)
+    sortie = io.BytesIO()
+    ecrire_trame(sortie, mode, lambda fichier: codec.compresser_donnees(data, fichier, **options))
+    return sortie.getvalue()
+
+
+def decompress(data, mode=None, **options) -> str:
+    """
+    Décompresse une trame produite par compress ; le mode est lu dans l'en-tête
+    `mode` ne sert qu'à lire d'anciennes données sans en-tête
+    Options : processus, depuis (voir les codecs)
+    """
+    with memoryview(data) as vue:
+        return "".join(_decompresser(vue, mode, **options))
+
+
+def compresser_fichier(chemin_entree, chemin_sortie, mode="classique", **options):
+    """
+    Compresse un fichier texte, lu par mmap et écrit par blocs (voir compress pour les options)
+    La sortie est écrite à part puis remplace chemin_sortie, qui peut donc être le fichier d'entrée
+    Retourne la décision de choisir_mode en mode "auto", None sinon
+    """
+    with ouvrir_carte(chemin_entree) as donnees, ouvrir_sortie(chemin_sortie) as fichier_sortie:
+        mode, decision = _mode_auto(donnees, mode, options)
+        codec = _codec(mode)
+        ecrire_trame(fichier_sortie, mode, lambda fichier: codec.compresser_donnees(donnees, fichier, **options))
+    return decision
+
+
+def ajouter_fichier(chemin_entree, chemin_sortie, mode="classique", reutiliser_arbre=False, **options):
+    """
+    Ajoute une trame à la fin d'un fichier compressé (créé s'il n'existe pas), sans réécrire les trames
+    existantes : le coût ne dépend que du nouveau texte. Avec reutiliser_arbre (mode classique),
+    la trame reprend l'arbre de la trame classique précédente si tous ses symboles y figurent
+    et que cela ne l'allonge pas. Retourne la décision de choisir_mode en mode "auto", None sinon
+    """
+    if os.path.exists(chemin_sortie) and os.path.samefile(chemin_entree, chemin_sortie):
+        raise ValueError(f"impossible d'ajouter {chemin_entree} à lui-même")
+    mode_demande = mode
+    with ouvrir_carte(chemin_entree) as donnees:
+        mode, decision = _mode_auto(donnees, mode, options)
+        if reutiliser_arbre and mode == "classique":
+            if os.path.exists(chemin_sortie):
+                with ouvrir_vue(chemin_sortie) as existant:
+                    options["arbre_precedent"] = _arbre_precedent(existant)
+        elif reutiliser_arbre and mode_demande != "auto":
+            raise ValueError("seul le mode classique peut réutiliser l'arbre de la trame précédente")
+
+        codec = _codec(mode)
+        with open(chemin_sortie, 'r+b' if os.path.exists(chemin_sortie) else 'wb') as fichier_sortie:
+            fichier_sortie.seek(0, os.SEEK_END)
+            if fichier_sortie.tell() > 0:
+                # on n'ajoute qu'à un fichier fait de trames (pas à un ancien fichier sans en-tête)
+                fichier_sortie.seek(0)
+                if not est_trame(fichier_sortie.read(TAILLE_ENTETE)):
+                    raise ErreurFormat(f"{chemin_sortie} n'est pas un fichier compressé avec en-tête")
+                fichier_sortie.seek(0, os.SEEK_END)
+            position = fichier_sortie.tell()
+            try:
+                ecrire_trame(fichier_sortie, mode,
+                             lambda fichier: codec.compresser_donnees(donnees, fichier, **options))
+            except BaseException:
+                # une trame inachevée rendrait illisibles les trames précédentes : on la retire
+                fichier_sortie.truncate(position)
+                raise
+    return decision
+
+
+def decompresser_fichier(chemin_entree, chemin_sortie, mode=None, **options):
+    """
+    Décompresse un fichier en écrivant le texte au fur et à mesure (voir decompress pour les options)
+    Comme pour compresser_fichier, la sortie peut être le fichier d'entrée
+    """
+    with ouvrir_vue(chemin_entree) as donnees, ouvrir_sortie(chemin_sortie, 'w', encoding='utf-8') as fichier_sortie:
+        for morceau in _decompresser(donnees, mode, chemin_entree, **options):
+            fichier_sortie.write(morceau)
+
+
+def detecter_mode(data):
+    """
+    Retourne le mode indiqué dans l'en-tête de données compressées, ou None s'il n'y a pas d'en-tête
+    """
+    with memoryview(data) as vue:
+        return lire_entete(vue)[0] if est_trame(vue) else None
+
+
+def choisir_mode(data, budget=None):
+    """
+    Estime taille et temps de compression de chaque mode sur un échantillon et retourne la décision
+    (dictionnaire prévu pour être journalisé, voir huffman.auto.choisir_mode)
+    `budget` : temps de compression maximal en secondes
+    """
+    from .auto import choisir_mode as choisir
+
+    return choisir(data, budget)
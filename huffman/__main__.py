@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Ligne de commande unique : python3 -m huffman -e ENTREE -o SORTIE [--mode MODE | --auto] [--ajouter] | -d ENTREE -o SORTIE
+"""
+
+import argparse
+import time
+
+from . import MODES, ajouter_fichier, compresser_fichier, decompresser_fichier
+from .auto import afficher_decision
+
+
+def main():
+    analyseur = argparse.ArgumentParser(prog="python3 -m huffman",
+                                        description="Compression de texte par l'algorithme de Huffman")
+    action = analyseur.add_mutually_exclusive_group(required=True)
+    action.add_argument("-e", metavar="fichier_entree", help="Fichier à compresser")
+    action.add_argument("-d", metavar="fichier_entree", help="Fichier à décompresser (mode détecté automatiquement)")
+    analyseur.add_argument("-o", metavar="fichier_sortie", required=True, help="Fichier de sortie")
+    choix = analyseur.add_mutually_exclusive_group()
+    choix.add_argument("--mode", choices=list(MODES), default="classique", help="Variante utilisée pour compresser")
+    choix.add_argument("--auto", action="store_true",
+                       help="Choisit la variante d'après l'entropie d'un échantillon de l'entrée")
+    analyseur.add_argument("--budget", metavar="SECONDES", type=float,
+                           help="Temps de compression maximal visé en mode --auto")
+    analyseur.add_argument("--ajouter", action="store_true",
+                           help="Ajoute une trame à la fin du fichier de sortie au lieu de le remplacer")
+
+    classique = analyseur.add_argument_group("mode classique")
+    classique.add_argument("--mots", action="store_true", help="Encode par mots/jetons plutôt que par caractères")
+    classique.add_argument("--seuil", type=int, help="Fréquence minimale d'un jeton en mode mots")
+    classique.add_argument("--flux", type=int, help="Nombre de sous-flux entrelacés (1 à 255)")
+    classique.add_argument("--reutiliser-arbre", action="store_true",
+                           help="Avec --ajouter, reprend l'arbre de la trame précédente quand c'est possible")
+
+    adaptatif = analyseur.add_argument_group("mode adaptatif")
+    politiques = adaptatif.add_mutually_exclusive_group()
+    politiques.add_argument("--division", metavar="SEUIL", type=int,
+                            help="Divise les poids par deux quand le poids de la racine atteint SEUIL")
+    politiques.add_argument("--reinitialisation", metavar="N", type=int,
+                            help="Réinitialise le modèle tous les N symboles")
+    adaptatif.add_argument("--points-de-reprise", metavar="N", type=int,
+                           help="Insère un instantané du modèle tous les N symboles")
+
+    rans = analyseur.add_argument_group("mode rans")
+    rans.add_argument("--modele", choices=["appris", "statique"],
+                      help="Fréquences apprises sur le texte ou dictionnaire du mode statique")
+    rans.add_argument("--etats", metavar="N", type=int, help="Nombre d'états rANS entrelacés (1 à 255)")
+
+    decodage = analyseur.add_argument_group("décompression")
+    decodage.add_argument("--processus", metavar="P", type=int, default=1,
+                          help="Décode les sous-flux, segments ou blocs sur P processus")
+    decodage.add_argument("--depuis", metavar="K", type=int, default=0,
+                          help="Décode à partir du K-ième point de reprise (mode adaptatif)")
+    arguments = analyseur.parse_args()
+
+    debut = time.time()
+    if arguments.d:
+        decompresser_fichier(arguments.d, arguments.o, processus=arguments.processus, depuis=arguments.depuis)
+        print(f"Fichier décompressé : {arguments.o}")
+    else:
+        options = options_compression(analyseur, arguments)
+        mode = "auto" if arguments.auto else arguments.mode
+        if arguments.ajouter:
+            decision = ajouter_fichier(arguments.e, arguments.o, mode, arguments.reutiliser_arbre, **options)
+        else:
+            decision = compresser_fichier(arguments.e, arguments.o, mode, **options)
+        if decision is not None:
+            afficher_decision(decision)
+            mode = decision["mode"]
+        print(f"{'Trame ajoutée' if arguments.ajouter else 'Fichier compressé'} ({mode}) : {arguments.o}")
+    print(f"temps d'exécution : {time.time() - debut:.3f} secondes")
+
+
+# options de la ligne de commande propres à chaque mode
+OPTIONS_PAR_MODE = {
+    "statique": (),
+    "classique": ("mots", "seuil", "flux", "reutiliser_arbre"),
+    "adaptatif": ("division", "reinitialisation", "points_de_reprise"),
+    "rans": ("modele", "etats"),
+    "auto": (),
+}
+
+
+def options_compression(analyseur, arguments):
+    """Traduit les options de la ligne de commande en options du codec choisi."""
+    mode = "auto" if arguments.auto else arguments.mode
+    ignorees = [nom for options in OPTIONS_PAR_MODE.values() for nom in options
+                if getattr(arguments, nom) not in (None, False) and nom not in OPTIONS_PAR_MODE[mode]]
+    if ignorees:
+        analyseur.error(f"options sans effet en mode {mode} : {', '.join(ignorees)}")
+    if arguments.budget is not None and mode != "auto":
+        analyseur.error("--budget ne s'utilise qu'avec --auto")
+    if arguments.reutiliser_arbre and not arguments.ajouter:
+        analyseur.error("--reutiliser-arbre ne s'utilise qu'avec --ajouter")
+
+    options = {}
+    if mode == "auto":
+        if arguments.budget is not None:
+            if arguments.budget <= 0:
+                analyseur.error("le budget doit être strictement positif")
+            options["budget"] = arguments.budget
+    elif arguments.mode == "classique":
+        if arguments.mots:
+            options["mots"] = True
+        if arguments.seuil is not None:
+            options["seuil"] = arguments.seuil
+        if arguments.flux is not None:
+            if not 1 <= arguments.flux <= 255:
+                analyseur.error("le nombre de sous-flux doit être compris entre 1 et 255")
+            options["flux"] = arguments.flux
+    elif arguments.mode == "adaptatif":
+        from .adaptatif import POLITIQUE_DIVISION, POLITIQUE_REINITIALISATION
+
+        if arguments.division is not None:
+            options["politique"], options["parametre"] = POLITIQUE_DIVISION, arguments.division
+        elif arguments.reinitialisation is not None:
+            options["politique"], options["parametre"] = POLITIQUE_REINITIALISATION, arguments.reinitialisation
+        if "parametre" in options and not 0 < options["parametre"] < 1 << 32:
+            analyseur.error("le paramètre de la politique doit être compris entre 1 et 2^32 - 1")
+        if arguments.points_de_reprise is not None:
+            if not 0 <= arguments.points_de_reprise < 1 << 32:
+                analyseur.error("l'intervalle entre points de reprise doit être compris entre 0 et 2^32 - 1")
+            options["intervalle"] = arguments.points_de_reprise
+    elif arguments.mode == "rans":
+        if arguments.modele is not None:
+            options["modele"] = arguments.modele
+        if arguments.etats is not None:
+            if not 1 <= arguments.etats <= 255:
+                analyseur.error("le nombre d'états doit être compris entre 1 et 255")
+            options["etats"] = arguments.etats
+    return options
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,728 @@
+# -*- coding: utf-8 -*-
+"""
+Huffman adaptatif (streaming) : l'arbre est construit au fil du flux par l'encodeur et le décodeur
+"""
+
+import argparse
+import heapq
+import os
+import time
+import warnings
+
+from .blocs import (TAILLE_BLOC, EcrivainBits, LecteurBits, blocs_bits, blocs_texte, ecrire_entier, lire_entier,
+                    ouvrir_vue, resultats_en_ordre)
+from .conteneur import ErreurFormat
+
+# politiques d'oubli du modèle, enregistrées dans l'en-tête du flux
+POLITIQUE_AUCUNE = 0
+POLITIQUE_DIVISION = 1          # divise les poids par deux quand la racine atteint un seuil
+POLITIQUE_REINITIALISATION = 2  # repart d'un arbre vide tous les N symboles
+
+# bit du premier octet indiquant un flux découpé en segments avec points de reprise
+DRAPEAU_POINTS_DE_REPRISE = 0x20
+
+# types de nœuds dans un instantané du modèle
+INSTANTANE_INTERNE = 0
+INSTANTANE_FEUILLE = 1
+INSTANTANE_NYT = 2
+
+# implementation classe noeud
+
+class Noeud:
+    def __init__(self, frequence: int, caractere=None, gauche=None, droite=None, parent=None, numero: int = 0) -> None:
+        self._frequence = frequence
+        self._caractere = caractere
+        self._gauche = gauche
+        self._droite = droite
+        self._parent = parent
+        self._numero = numero
+
+    def get_frequence(self) -> int:
+        return self._frequence
+
+    def get_caractere(self):
+        return self._caractere
+
+    def get_gauche(self):
+        return self._gauche
+
+    def get_droite(self):
+        return self._droite
+
+    def get_parent(self):
+        return self._parent
+    
+    def get_numero(self) -> int:
+        return self._numero
+
+    def set_frequence(self, frequence: int):
+        self._frequence = frequence
+
+    def set_caractere(self, caractere):
+        self._caractere = caractere
+
+    def set_gauche(self, gauche):
+        self._gauche = gauche
+
+    def set_droite(self, droite):
+        self._droite = droite
+
+    def set_parent(self, parent):
+        self._parent = parent
+        
+    def set_numero(self, numero: int):
+        self._numero = numero
+
+    def est_feuille(self) -> bool:
+        return self._gauche is None and self._droite is None
+
+# implementation classe arbre
+
+class ArbreHuffman:
+    def __init__(self, politique: int = POLITIQUE_AUCUNE, parametre: int = 0):
+        self.politique = politique
+        self.parametre = parametre
+        self.symboles_traites = 0
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """
+        Remet le modèle à zéro : l'arbre ne contient plus que le NYT
+        """
+        self.NYT = Noeud(frequence=0, caractere=None, numero=512) 
+        self.racine = self.NYT
+        self.symbole_vers_noeud = {}
+        self.numero_vers_noeud = {1000: self.NYT}
+        self.numero_max = 1000
+
+    def appliquer_politique(self):
+        """
+        Applique la politique d'oubli après la mise à jour d'un symbole
+        L'encodeur et le décodeur l'appliquent aux mêmes instants, ils restent synchronisés
+        """
+        self.symboles_traites += 1
+        if self.politique == POLITIQUE_DIVISION and self.racine.get_frequence() >= self.seuil_division():
+            self.diviser_poids()
+        elif self.politique == POLITIQUE_REINITIALISATION and self.symboles_traites % self.parametre == 0:
+            self.reinitialiser()
+
+    def seuil_division(self):
+        """
+        Poids de la racine à partir duquel les poids sont divisés : le paramètre, mais au moins deux fois
+        le nombre de symboles. Chaque symbole garde un poids d'au moins 1 après division ; avec un seuil
+        plus petit, la racine le dépasserait encore et l'arbre serait reconstruit à chaque symbole
+        """
+        return max(self.parametre, 2 * len(self.symbole_vers_noeud))
+
+    def diviser_poids(self):
+        """
+        Divise par deux (arrondi supérieur) le poids de chaque symbole et reconstruit l'arbre
+        Les nœuds sont renumérotés dans l'ordre de fusion, ce qui respecte la propriété de fratrie
+        """
+        # le NYT (poids 0) passe en premier, puis les symboles dans leur ordre d'apparition ;
+        # un symbole garde un poids d'au moins 1 pour que seul le NYT soit de poids nul
+        file = [(0, 0, self.NYT)]
+        for ordre, (symbole, feuille) in enumerate(self.symbole_vers_noeud.items(), start=1):
+            poids = max(1, (feuille.get_frequence() + 1) // 2)
+            file.append((poids, ordre, Noeud(frequence=poids, caractere=symbole)))
+        heapq.heapify(file)
+        ordre = len(file)
+
+        ordre_fusion = []
+        while len(file) > 1:
+            _, _, gauche = heapq.heappop(file)
+            _, _, droite = heapq.heappop(file)
+            parent = Noeud(frequence=gauche.get_frequence() + droite.get_frequence(), gauche=gauche, droite=droite)
+            gauche.set_parent(parent)
+            droite.set_parent(parent)
+            ordre_fusion += [gauche, droite]
+            heapq.heappush(file, (parent.get_frequence(), ordre, parent))
+            ordre += 1
+
+        self.racine = file[0][2]
+        self.racine.set_parent(None)
+        self.symbole_vers_noeud = {}
+        self.numero_vers_noeud = {}
+
+        # la racine garde le plus grand numéro, le NYT (fusionné en premier) le plus petit
+        numero = 999
+        for noeud in [self.racine] + ordre_fusion[::-1]:
+            noeud.set_numero(numero)
+            self.numero_vers_noeud[numero] = noeud
+            if noeud.get_caractere() is not None:
+                self.symbole_vers_noeud[noeud.get_caractere()] = noeud
+            numero -= 1
+        self.numero_max = numero + 1
+
+    def obtenir_code(self, symbole):
+        """
+        Retourne le code binaire associé à un symbole
+        Si le symbole est nouveau, encode le chemin vers le NYT et le symbole en UTF-8
+        """
+        if symbole in self.symbole_vers_noeud:
+            return self.obtenir_chemin(self.symbole_vers_noeud[symbole])
+        else: 
+            # si le symbole est nouveau, on envoie le code du NYT puis le symbole lui-même
+            symbole_encode_en_octets = symbole.encode('utf-8')
+            # Chemin vers NYT + représentation binaire de la longueur des octets du symbole + représentation binaire des octets du symbole
+            chemin_nyt = self.obtenir_chemin(self.NYT)  # obtenir le chemin binaire vers le NYT
+            longueur_utf8 = f"{len(symbole_encode_en_octets):08b}"
+            octets_utf8 = ''.join(f"{octet:08b}" for octet in symbole_encode_en_octets)
+
+            # concaténation du chemin NYT, de la longueur UTF-8 et des octets UTF-8
+            code_binaire = chemin_nyt + longueur_utf8 + octets_utf8
+
+            return code_binaire
+
+    def obtenir_chemin(self, noeud):
+        """
+        Calcule le chemin binaire d'un nœud en remontant jusqu'à la racine
+        """
+        chemin = ""
+        noeud_courant = noeud
+        while noeud_courant is not None and noeud_courant != self.racine:
+            parent_noeud = noeud_courant.get_parent()
+            if parent_noeud.get_gauche() == noeud_courant:
+                chemin = "0" + chemin
+            else:
+                chemin = "1" + chemin
+            noeud_courant = parent_noeud
+        return chemin
+
+    def mettre_a_jour(self, symbole):
+        """
+        Met à jour l'arbre après avoir traité un symbole
+        Ajoute un nouveau nœud si le symbole est nouveau, ou incrémente la fréquence sinon
+        """
+        noeud_a_incrementer_ou_parent_du_nouveau = None
+
+        if symbole in self.symbole_vers_noeud:
+            # le symbole existe déjà donc on va incrémenter sa feuille
+            noeud_actuel = self.symbole_vers_noeud[symbole]
+            noeud_a_incrementer_ou_parent_du_nouveau = noeud_actuel
+        else:
+            # c'est un nouveau symbole
+            # on étend l'arbre à partir du NYT
+            parent_NYT = self.NYT.get_parent()
+            nouveau_noeud_interne = Noeud(frequence=0, parent=parent_NYT, numero=self.numero_max - 1)
+            # la nouvelle feuille pour le symbole et l'ancien NYT deviennent enfants du nouveau noeud interne
+            nouvelle_feuille = Noeud(frequence=0, caractere=symbole, parent=nouveau_noeud_interne, numero=self.numero_max - 2)
+            
+            nouveau_noeud_interne.set_gauche(self.NYT)
+            nouveau_noeud_interne.set_droite(nouvelle_feuille)
+            self.NYT.set_parent(nouveau_noeud_interne)
+
+            if parent_NYT is not None:
+                if parent_NYT.get_gauche() == self.NYT: # Si NYT était le fils gauche de son parent
+                    parent_NYT.set_gauche(nouveau_noeud_interne)
+                else: # Si NYT était le fils droit
+                    parent_NYT.set_droite(nouveau_noeud_interne)
+            else: # NYT était la racine
+                self.racine = nouveau_noeud_interne
+
+            self.numero_max -= 2
+            self.numero_vers_noeud[nouveau_noeud_interne.get_numero()] = nouveau_noeud_interne
+            self.numero_vers_noeud[nouvelle_feuille.get_numero()] = nouvelle_feuille
+            self.symbole_vers_noeud[symbole] = nouvelle_feuille
+
+            # on commence l'incrémentation à partir du parent du nouveau noeud (le nouveau noeud interne)
+            noeud_a_incrementer_ou_parent_du_nouveau = nouveau_noeud_interne
+
+        # on remonte vers la racine en bouclant jusqu'à ce qu'on l'atteigne
+        noeud_courant_pour_maj = noeud_a_incrementer_ou_parent_du_nouveau
+        while noeud_courant_pour_maj is not None:
+            meneur = self.trouver_leader(noeud_courant_pour_maj)
+            # si un meneur existe, n'est pas le noeud courant lui-même, et n'est pas son parent (pour éviter des échanges invalides)
+            if meneur is not None and meneur != noeud_courant_pour_maj and meneur != noeud_courant_pour_maj.get_parent():
+                self.echanger_noeuds(noeud_courant_pour_maj, meneur)
+            
+            noeud_courant_pour_maj.set_frequence(noeud_courant_pour_maj.get_frequence() + 1)
+            noeud_courant_pour_maj = noeud_courant_pour_maj.get_parent()
+
+        self.appliquer_politique()
+
+    def trouver_leader(self, noeud_ref):
+        """
+        Trouve le nœud leader ayant la même fréquence que le nœud de référence,
+        mais avec un numéro plus élevé
+        """
+        frequence_ref = noeud_ref.get_frequence()
+        candidats = []
+        for n in self.numero_vers_noeud.values():
+            # Un meneur doit avoir la même fréquence, ne pas être le noeud de référence lui-même,
+            # et ne pas être le parent du noeud de référence
+            if n.get_frequence() == frequence_ref and n != noeud_ref and n.get_parent() != noeud_ref:
+                candidats.append(n)
+        
+        if not candidats:
+            return None
+        # Le meneur est celui avec le plus grand numéro parmi les candidats
+        return max(candidats, key=lambda x: x.get_numero())
+
+    def echanger_noeuds(self, noeud_a, noeud_b):
+        """
+        Échange deux nœuds dans l'arbre, en mettant à jour leurs parents et leurs numéros
+        """
+        parent_a = noeud_a.get_parent()
+        parent_b = noeud_b.get_parent()
+        
+        # on met à jour les noeuds gauche et droite des noeuds parents
+        if parent_a is not None:
+            if parent_a.get_gauche() == noeud_a:
+                parent_a.set_gauche(noeud_b)
+            else:
+                parent_a.set_droite(noeud_b)
+        else: # noeud_a = la racine
+            self.racine = noeud_b
+
+        if parent_b is not None:
+            if parent_b.get_gauche() == noeud_b:
+                parent_b.set_gauche(noeud_a)
+            else:
+                parent_b.set_droite(noeud_a)
+        else: # noeud_b = la racine
+            self.racine = noeud_a
+            
+        # Mettre à jour les parents des noeuds échangés
+        noeud_a.set_parent(parent_b)
+        noeud_b.set_parent(parent_a)
+        
+        # Échanger les numéros
+        num_a = noeud_a.get_numero()
+        num_b = noeud_b.get_numero()
+        noeud_a.set_numero(num_b)
+        noeud_b.set_numero(num_a)
+        
+        # on met à jour le dictionnaire numero_vers_noeud
+        self.numero_vers_noeud[noeud_a.get_numero()] = noeud_a
+        self.numero_vers_noeud[noeud_b.get_numero()] = noeud_b
+        
+        # Mise à jour du symbole_vers_noeud si les noeuds sont des feuilles avec des symboles
+        if noeud_a.est_feuille() and noeud_a.get_caractere() is not None:
+            self.symbole_vers_noeud[noeud_a.get_caractere()] = noeud_a
+        if noeud_b.est_feuille() and noeud_b.get_caractere() is not None:
+            self.symbole_vers_noeud[noeud_b.get_caractere()] = noeud_b
+
+    def vers_instantane(self) -> bytes:
+        """
+        Sérialise l'état complet du modèle (forme de l'arbre, poids, numéros, position du NYT)
+        Les nœuds sont écrits dans l'ordre d'un parcours de l'arbre depuis la racine, puis viennent
+        les entrées de numero_vers_noeud dans leur ordre (parcouru par trouver_leader) et l'ordre
+        des symboles (parcouru par diviser_poids) : un modèle restauré se comporte exactement comme
+        l'original. L'index est écrit tel quel, car il ne reflète pas toujours l'arbre : le NYT
+        initial y est rangé sous la clé 1000 avec le numéro 512, et quand un autre nœud reçoit
+        ce numéro, un échange peut ranger un nœud sous deux clés et en faire sortir un autre.
+        """
+        noeuds = []
+        a_visiter = [self.racine]
+        while a_visiter:
+            noeud = a_visiter.pop()
+            noeuds.append(noeud)
+            for enfant in (noeud.get_droite(), noeud.get_gauche()):
+                if enfant is not None:
+                    a_visiter.append(enfant)
+        index_noeud = {id(noeud): index for index, noeud in enumerate(noeuds)}
+        # par précaution, un nœud de l'index détaché de l'arbre est lui aussi conservé
+        for noeud in self.numero_vers_noeud.values():
+            if id(noeud) not in index_noeud:
+                index_noeud[id(noeud)] = len(noeuds)
+                noeuds.append(noeud)
+
+        octets = bytearray()
+        octets += ecrire_entier(self.symboles_traites)
+        octets += ecrire_entier(1000 - self.numero_max)
+        octets += ecrire_entier(len(noeuds))
+        for noeud in noeuds:
+            parent = noeud.get_parent()
+            if noeud is self.NYT:
+                type_noeud = INSTANTANE_NYT
+            elif noeud.est_feuille():
+                type_noeud = INSTANTANE_FEUILLE
+            else:
+                type_noeud = INSTANTANE_INTERNE
+            cote = 1 if parent is not None and parent.get_droite() is noeud else 0
+            enfant = 1 if parent is not None and (parent.get_gauche() is noeud or cote) else 0
+
+            octets.append(type_noeud | cote << 2 | enfant << 3)
+            # les numéros ne dépassent jamais 1000 : on stocke l'écart, toujours positif
+            octets += ecrire_entier(1000 - noeud.get_numero())
+            octets += ecrire_entier(noeud.get_frequence())
+            octets += ecrire_entier(0 if parent is None else index_noeud[id(parent)] + 1)
+            if type_noeud == INSTANTANE_FEUILLE:
+                symbole_encode_en_octets = noeud.get_caractere().encode('utf-8')
+                octets += ecrire_entier(len(symbole_encode_en_octets)) + symbole_encode_en_octets
+        octets += ecrire_entier(len(self.numero_vers_noeud))
+        for cle, noeud in self.numero_vers_noeud.items():
+            octets += ecrire_entier(1000 - cle) + ecrire_entier(index_noeud[id(noeud)])
+        octets += ecrire_entier(len(self.symbole_vers_noeud))
+        for feuille in self.symbole_vers_noeud.values():
+            octets += ecrire_entier(index_noeud[id(feuille)])
+        return bytes(octets)
+
+    @classmethod
+    def depuis_instantane(cls, donnees, position: int = 0, politique: int = POLITIQUE_AUCUNE, parametre: int = 0):
+        """
+        Reconstruit un modèle à partir d'un instantané lu dans donnees à partir de position
+        Retourne le modèle et la position qui suit l'instantané
+        """
+        arbre = cls(politique, parametre)
+        arbre.symboles_traites, position = lire_entier(donnees, position)
+        ecart_numero_max, position = lire_entier(donnees, position)
+        arbre.numero_max = 1000 - ecart_numero_max
+        nombre_noeuds, position = lire_entier(donnees, position)
+
+        noeuds = []
+        for _ in range(nombre_noeuds):
+            type_noeud = donnees[position] & 0x03
+            cote = donnees[position] >> 2 & 1
+            enfant = donnees[position] >> 3 & 1
+            position += 1
+            ecart_numero, position = lire_entier(donnees, position)
+            frequence, position = lire_entier(donnees, position)
+            index_parent, position = lire_entier(donnees, position)
+
+            noeud = Noeud(frequence=frequence, numero=1000 - ecart_numero)
+            if type_noeud == INSTANTANE_FEUILLE:
+                longueur_utf8, position = lire_entier(donnees, position)
+                symbole = bytes(donnees[position:position + longueur_utf8]).decode('utf-8')
+                position += longueur_utf8
+                noeud.set_caractere(symbole)
+            elif type_noeud == INSTANTANE_NYT:
+                arbre.NYT = noeud
+            noeuds.append((noeud, index_parent, cote, enfant))
+
+        # on relie chaque nœud à son parent une fois tous les nœuds créés ; la racine est le premier
+        arbre.racine = noeuds[0][0]
+        for noeud, index_parent, cote, enfant in noeuds:
+            if index_parent == 0:
+                continue
+            parent = noeuds[index_parent - 1][0]
+            noeud.set_parent(parent)
+            if not enfant:
+                continue
+            if cote:
+                parent.set_droite(noeud)
+            else:
+                parent.set_gauche(noeud)
+
+        # l'index des numéros est restauré tel quel, dans son ordre
+        arbre.numero_vers_noeud = {}
+        nombre_entrees, position = lire_entier(donnees, position)
+        for _ in range(nombre_entrees):
+            ecart_cle, position = lire_entier(donnees, position)
+            index_noeud, position = lire_entier(donnees, position)
+            arbre.numero_vers_noeud[1000 - ecart_cle] = noeuds[index_noeud][0]
+
+        # les symboles retrouvent leur ordre d'apparition
+        arbre.symbole_vers_noeud = {}
+        nombre_symboles, position = lire_entier(donnees, position)
+        for _ in range(nombre_symboles):
+            index_feuille, position = lire_entier(donnees, position)
+            feuille = noeuds[index_feuille][0]
+            arbre.symbole_vers_noeud[feuille.get_caractere()] = feuille
+        return arbre, position
+
+
+# compression
+
+def ouvrir_segment(fichier_sortie, arbre):
+    """
+    Commence un segment : longueur (réservée), instantané du modèle, octet de padding (réservé)
+    Retourne les positions à réécrire et l'écrivain des données du segment
+    """
+    position_longueur = fichier_sortie.tell()
+    fichier_sortie.write(b"\0\0\0\0")
+    fichier_sortie.write(arbre.vers_instantane())
+    position_padding = fichier_sortie.tell()
+    fichier_sortie.write(b"\0")
+    return position_longueur, position_padding, EcrivainBits(fichier_sortie)
+
+
+def fermer_segment(fichier_sortie, segment):
+    """
+    Termine un segment ouvert par ouvrir_segment et réécrit sa longueur et son padding
+    """
+    position_longueur, position_padding, ecrivain = segment
+    longueur_padding = ecrivain.terminer()
+    position_fin = fichier_sortie.tell()
+
+    fichier_sortie.seek(position_longueur)
+    fichier_sortie.write((position_fin - position_longueur - 4).to_bytes(4, 'big'))
+    fichier_sortie.seek(position_padding)
+    fichier_sortie.write(bytes([longueur_padding]))
+    fichier_sortie.seek(0, os.SEEK_END)
+
+
+def compresser_flux(blocs, fichier_sortie, politique=POLITIQUE_AUCUNE, parametre=0, intervalle=0):
+    """
+    Compresse des blocs de texte avec l'algorithme de Huffman adaptatif,
+    en écrivant le résultat au fil de l'eau dans un fichier binaire
+    En-tête : un octet (drapeaux | politique << 3 | padding) puis, si une politique est choisie,
+    son paramètre sur 4 octets
+    Si intervalle > 0, il est écrit sur 4 octets et le flux est découpé en segments de
+    `intervalle` symboles, chacun précédé d'un instantané du modèle (point de reprise)
+    """
+    arbre = ArbreHuffman(politique, parametre)
+
+    # le premier octet (taille du padding) est réservé puis réécrit à la fin
+    position_padding = fichier_sortie.tell()
+    fichier_sortie.write(b"\0")
+    if politique != POLITIQUE_AUCUNE:
+        fichier_sortie.write(parametre.to_bytes(4, 'big'))
+    if intervalle:
+        fichier_sortie.write(intervalle.to_bytes(4, 'big'))
+        segment = ouvrir_segment(fichier_sortie, arbre)
+        ecrivain = segment[2]
+    else:
+        ecrivain = EcrivainBits(fichier_sortie)
+
+    symboles_du_segment = 0
+    for bloc in blocs:
+        liste_de_codes_bits = [] # Utiliser une liste pour accumuler les codes du bloc
+        for caractere_actuel in bloc:
+            if intervalle and symboles_du_segment == intervalle:
+                # point de reprise : on ferme le segment et on en ouvre un nouveau
+                ecrivain.ecrire("".join(liste_de_codes_bits))
+                liste_de_codes_bits = []
+                fermer_segment(fichier_sortie, segment)
+                segment = ouvrir_segment(fichier_sortie, arbre)
+                ecrivain = segment[2]
+                symboles_du_segment = 0
+            code_pour_caractere = arbre.obtenir_code(caractere_actuel)
+            liste_de_codes_bits.append(code_pour_caractere)
+            arbre.mettre_a_jour(caractere_actuel)
+            symboles_du_segment += 1
+        ecrivain.ecrire("".join(liste_de_codes_bits))
+
+    if intervalle:
+        # chaque segment porte son propre padding
+        fermer_segment(fichier_sortie, segment)
+        octet_entete = DRAPEAU_POINTS_DE_REPRISE | politique << 3
+    else:
+        # le dernier octet est complété par des zéros
+        octet_entete = politique << 3 | ecrivain.terminer()
+
+    fichier_sortie.seek(position_padding)
+    fichier_sortie.write(bytes([octet_entete]))
+    fichier_sortie.seek(0, os.SEEK_END)
+
+
+def compresser_donnees(donnees, fichier_sortie, politique=POLITIQUE_AUCUNE, parametre=0, intervalle=0):
+    """
+    Compresse des octets UTF-8 (bytes, mmap ou memoryview) dans un fichier binaire
+    """
+    compresser_flux(blocs_texte(donnees), fichier_sortie, politique, parametre, intervalle)
+
+# decompression
+
+def lire_entete(donnees):
+    """
+    Lit l'en-tête d'un flux adaptatif
+    Retourne la politique, son paramètre, l'intervalle entre points de reprise (0 sans points de reprise)
+    et la position du premier octet de données
+    """
+    politique = donnees[0] >> 3 & 0x03
+    parametre = 0
+    intervalle = 0
+    position = 1
+    if politique != POLITIQUE_AUCUNE:
+        parametre = int.from_bytes(donnees[position:position + 4], 'big')
+        position += 4
+    if donnees[0] & DRAPEAU_POINTS_DE_REPRISE:
+        intervalle = int.from_bytes(donnees[position:position + 4], 'big')
+        position += 4
+    return politique, parametre, intervalle, position
+
+
+def lister_segments(donnees, position):
+    """
+    Parcourt les longueurs des segments sans les décoder
+    Retourne la liste des (début, fin) du contenu de chaque segment
+    """
+    segments = []
+    while position + 4 <= len(donnees):
+        longueur = int.from_bytes(donnees[position:position + 4], 'big')
+        segments.append((position + 4, position + 4 + longueur))
+        position += 4 + longueur
+    return segments
+
+
+def decompresser_segment(donnees, debut, fin, politique=POLITIQUE_AUCUNE, parametre=0):
+    """
+    Décompresse un segment seul à partir de son instantané, sans rejouer les segments précédents
+    """
+    arbre, position_padding = ArbreHuffman.depuis_instantane(donnees, debut, politique, parametre)
+    blocs = blocs_bits(donnees, position_padding + 1, fin, position_padding)
+    yield from decompresser_blocs(blocs, politique, parametre, arbre)
+
+
+def decompresser_segment_fichier(emplacement, debut, fin, politique, parametre):
+    """
+    Décompresse un segment d'un fichier (utilisé par les processus de décompression parallèle)
+    emplacement donne le chemin du fichier et la position des données compressées dans celui-ci
+    """
+    with ouvrir_vue(*emplacement) as donnees:
+        return "".join(decompresser_segment(donnees, debut, fin, politique, parametre))
+
+
+def decompresser_blocs(blocs, politique=POLITIQUE_AUCUNE, parametre=0, arbre=None):
+    """
+    Décompresse des blocs de bits utiles avec l'algorithme de Huffman adaptatif
+    et produit le texte décodé par morceaux d'environ TAILLE_BLOC caractères
+    Un arbre restauré depuis un instantané peut être fourni pour reprendre en cours de flux
+    """
+    # on reproduit l'arbre qu'on va enrichir au
+    # fur et a mesure pour décompresser le flux
+    if arbre is None:
+        arbre = ArbreHuffman(politique, parametre)
+    lecteur = LecteurBits(blocs)
+
+    liste_caracteres_decodes = []
+    bit_actuel = lecteur.lire(1)
+
+    while bit_actuel:
+        noeud_parcours = arbre.racine
+
+        while not noeud_parcours.est_feuille():
+            if not bit_actuel:
+                # Fin inattendue du flux de bits pendant la traversée
+                raise ErreurFormat("flux adaptatif tronqué : fin des bits au milieu d'un symbole")
+
+            if bit_actuel == '0':
+                noeud_parcours = noeud_parcours.get_gauche()
+            else:
+                noeud_parcours = noeud_parcours.get_droite()
+
+            bit_actuel = lecteur.lire(1)
+            if noeud_parcours is None:
+                raise ErreurFormat("flux adaptatif corrompu : chemin invalide dans l'arbre")
+
+        symbole_resultat_decodage = None
+
+        if noeud_parcours == arbre.NYT: # Comparaison avec l'objet NYT de l'arbre
+            # Décodage d'un nouveau symbole (NYT)
+            # Le bit déjà lu est le premier des 8 bits de longueur du symbole en UTF-8
+            bits_pour_longueur_symbole_utf8 = bit_actuel + lecteur.lire(7)
+            if len(bits_pour_longueur_symbole_utf8) < 8:
+                raise ErreurFormat("flux adaptatif tronqué : longueur d'un nouveau symbole incomplète")
+            longueur_symbole_utf8 = int(bits_pour_longueur_symbole_utf8, 2)
+
+            # Lire les octets du symbole UTF-8
+            bits_symbole = lecteur.lire(8 * longueur_symbole_utf8)
+            if len(bits_symbole) < 8 * longueur_symbole_utf8:
+                raise ErreurFormat(f"flux adaptatif tronqué : les {longueur_symbole_utf8} octets "
+                                   "d'un nouveau symbole sont incomplets")
+
+            liste_octets_pour_symbole = []
+            for debut in range(0, len(bits_symbole), 8):
+                valeur_octet_symbole = int(bits_symbole[debut : debut + 8], 2)
+                liste_octets_pour_symbole.append(valeur_octet_symbole)
+
+            octets_symbole_complets = bytes(liste_octets_pour_symbole)
+            try:
+                symbole_resultat_decodage = octets_symbole_complets.decode('utf-8')
+            except UnicodeDecodeError:
+                raise ErreurFormat(f"flux adaptatif corrompu : nouveau symbole en UTF-8 invalide "
+                                   f"({octets_symbole_complets!r})") from None
+            bit_actuel = lecteur.lire(1)
+
+        else: # C'est une feuille existante
+            symbole_resultat_decodage = noeud_parcours.get_caractere()
+
+        liste_caracteres_decodes.append(symbole_resultat_decodage)
+        arbre.mettre_a_jour(symbole_resultat_decodage)
+
+        if len(liste_caracteres_decodes) >= TAILLE_BLOC:
+            # on rend la main par morceaux pour ne pas garder tout le texte en mémoire
+            yield "".join(liste_caracteres_decodes)
+            liste_caracteres_decodes = []
+
+    yield "".join(liste_caracteres_decodes)
+
+
+def decompresser_donnees(donnees, emplacement=None, processus=1, depuis=0):
+    """
+    Décompresse des octets produits par compresser_donnees, morceau par morceau
+    Pour un flux avec points de reprise, `depuis` est le premier segment à décoder et
+    `processus` le nombre de processus décodant les segments en parallèle ; ceux-ci relisent
+    eux-mêmes le fichier décrit par emplacement (chemin, début, fin)
+    """
+    if len(donnees) == 0:
+        return
+    politique, parametre, intervalle, debut = lire_entete(donnees)
+
+    if not intervalle:
+        if depuis:
+            warnings.warn("ce fichier n'a pas de points de reprise, décodage depuis le début", stacklevel=2)
+        yield from decompresser_blocs(blocs_bits(donnees, debut), politique, parametre)
+        return
+
+    segments = lister_segments(donnees, debut)[depuis:]
+    if processus > 1 and emplacement is not None:
+        # import tardif : le démarrage reste rapide quand on décode sur un seul cœur
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            # deux segments en vol par processus : les processus restent occupés sans que les segments
+            # décodés d'avance s'accumulent en mémoire
+            yield from resultats_en_ordre(executeur, decompresser_segment_fichier,
+                                          ((emplacement, debut_segment, fin_segment, politique, parametre)
+                                           for debut_segment, fin_segment in segments),
+                                          2 * processus)
+    else:
+        for debut_segment, fin_segment in segments:
+            yield from decompresser_segment(donnees, debut_segment, fin_segment, politique, parametre)
+
+
+def main():
+    analyseur = argparse.ArgumentParser(description="Compression Huffman adaptative (streaming, UTF-8)")
+    analyseur.add_argument("-e", metavar="fichier_entree", help="Fichier à compresser")
+    analyseur.add_argument("-d", metavar="fichier_entree", help="Fichier à décompresser")
+    analyseur.add_argument("-o", metavar="fichier_sortie", required=True, help="Fichier de sortie")
+    politiques = analyseur.add_mutually_exclusive_group()
+    politiques.add_argument("--division", metavar="SEUIL", type=int,
+                            help="Divise les poids par deux quand le poids de la racine atteint SEUIL")
+    politiques.add_argument("--reinitialisation", metavar="N", type=int,
+                            help="Réinitialise le modèle tous les N symboles")
+    analyseur.add_argument("--points-de-reprise", metavar="N", type=int, default=0,
+                           help="Insère un instantané du modèle tous les N symboles (reprise, accès direct)")
+    analyseur.add_argument("--depuis", metavar="K", type=int, default=0,
+                           help="Décode à partir du K-ième point de reprise")
+    analyseur.add_argument("--processus", metavar="P", type=int, default=1,
+                           help="Décode les segments sur P processus en parallèle")
+    arguments = analyseur.parse_args()
+
+    politique, parametre = POLITIQUE_AUCUNE, 0
+    if arguments.division is not None:
+        politique, parametre = POLITIQUE_DIVISION, arguments.division
+    elif arguments.reinitialisation is not None:
+        politique, parametre = POLITIQUE_REINITIALISATION, arguments.reinitialisation
+    if politique != POLITIQUE_AUCUNE and not 0 < parametre < 1 << 32:
+        analyseur.error("le paramètre de la politique doit être compris entre 1 et 2^32 - 1")
+    if not 0 <= arguments.points_de_reprise < 1 << 32:
+        analyseur.error("l'intervalle entre points de reprise doit être compris entre 0 et 2^32 - 1")
+
+    from . import compresser_fichier, decompresser_fichier
+
+    debut = time.time()
+    if arguments.e:
+        compresser_fichier(arguments.e, arguments.o, "adaptatif", politique=politique, parametre=parametre,
+                           intervalle=arguments.points_de_reprise)
+        print(f"Fichier compressé : {arguments.o}")
+    elif arguments.d:
+        # on vérifie que le fichier existe
+        if not os.path.isfile(arguments.d):
+            print(f"Erreur : Le fichier d'entrée '{arguments.d}' est introuvable.")
+            return
+        # les fichiers sans en-tête (anciennes versions) sont lus comme du Huffman adaptatif
+        try:
+            decompresser_fichier(arguments.d, arguments.o, mode="adaptatif", processus=arguments.processus,
+                                 depuis=arguments.depuis)
+        except ErreurFormat as erreur:
+            print(f"Erreur : {erreur}")
+            return
+        print(f"Fichier décompressé : {arguments.o}")
+    else:
+        print("Spécifiez -e (encoder) ou -d (décoder).") 
+    fin = time.time()
+    print(f"temps d'exécution : {fin - debut:.3f} secondes")
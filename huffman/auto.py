@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Choix automatique du mode à partir d'un échantillon de l'entrée
+
+On estime, sans compresser tout le fichier :
+- l'entropie empirique de l'échantillon et la part de caractères absents du dictionnaire statique ;
+- la taille produite par les modes statique (longueur exacte des codes fixes et des échappements)
+  et classique (codes de Huffman de l'échantillon plus l'arbre sérialisé en tête) ;
+- la taille produite par le rANS, d'après le coût exact de chaque symbole dans le modèle appris ;
+- le temps de compression de chaque mode, mesuré sur un petit extrait et extrapolé au nombre de
+  caractères. L'adaptatif fait exception : son coût par symbole croît avec la taille de l'alphabet,
+  son temps est donc estimé en symboles × alphabet, d'après une sonde limitée à DELAI_SONDE secondes
+  sur des préfixes croissants de l'extrait. Sa taille est celle du classique, corrigée du rapport
+  adaptatif / classique observé sur le préfixe sondé.
+
+Le mode retenu est le plus compact parmi ceux qui tiennent dans le budget de temps ; à taille
+quasi égale (écart inférieur à TOLERANCE), le plus rapide l'emporte. Sans budget, on accepte jusqu'à
+FACTEUR_BUDGET fois le temps du mode le plus rapide (et au moins BUDGET_MINIMAL secondes) : quelques
+pour cent de taille ne justifient pas une compression cent fois plus lente.
+"""
+
+import io
+import math
+import time
+
+from .blocs import TAILLE_BLOC
+from .conteneur import MODES, TAILLE_ENTETE
+
+TAILLE_ECHANTILLON = 1 << 16  # octets lus pour estimer les fréquences
+NOMBRE_FENETRES = 4           # l'échantillon est pris en plusieurs endroits du fichier
+TAILLE_MESURE = 2048          # caractères compressés pour mesurer la vitesse de chaque mode
+TOLERANCE = 0.01              # écart de taille relatif en dessous duquel on préfère le mode le plus rapide
+TAILLE_SONDE = 128            # premier préfixe compressé par la sonde de l'adaptatif
+DELAI_SONDE = 0.1             # durée au-delà de laquelle la sonde de l'adaptatif s'arrête (secondes)
+FACTEUR_BUDGET = 4            # sans budget : temps accepté, en multiple du mode le plus rapide
+BUDGET_MINIMAL = 1.0          # sans budget : temps toujours accepté (secondes)
+
+
+def echantillonner(donnees, taille=TAILLE_ECHANTILLON, fenetres=NOMBRE_FENETRES):
+    """
+    Extrait un échantillon de texte réparti sur l'ensemble des données UTF-8
+    Les caractères coupés aux bords des fenêtres sont ignorés
+    """
+    if len(donnees) <= taille:
+        return bytes(donnees).decode('utf-8', errors='ignore')
+
+    largeur = taille // fenetres
+    pas = (len(donnees) - largeur) // (fenetres - 1)
+    morceaux = [bytes(donnees[i * pas:i * pas + largeur]).decode('utf-8', errors='ignore') for i in range(fenetres)]
+    return "".join(morceaux)
+
+
+def entropie(frequences) -> float:
+    """
+    Entropie empirique (en bits par symbole) d'un dictionnaire de fréquences
+    """
+    total = sum(frequences.values())
+    return -sum(f / total * math.log2(f / total) for f in frequences.values() if f) if total else 0.0
+
+
+def mesurer(mode, extrait):
+    """
+    Compresse un court extrait avec un mode
+    Sortie : (temps de compression par caractère, taille compressée en octets)
+    """
+    from . import _codec
+
+    if not extrait:
+        return 0.0, 0
+    sortie = io.BytesIO()
+    debut = time.perf_counter()
+    _codec(mode).compresser_donnees(extrait.encode('utf-8'), sortie)
+    return (time.perf_counter() - debut) / len(extrait), len(sortie.getvalue())
+
+
+def sonder_adaptatif(extrait, delai=DELAI_SONDE):
+    """
+    Compresse en adaptatif des préfixes de l'extrait de longueur doublée à chaque fois, jusqu'à ce
+    qu'une compression dure plus de `delai` secondes ou que l'extrait entier soit traité
+    Sortie : (longueur du dernier préfixe, temps de compression par caractère, taille compressée)
+    """
+    longueur = min(TAILLE_SONDE, len(extrait))
+    while True:
+        temps, taille = mesurer("adaptatif", extrait[:longueur])
+        if longueur == len(extrait) or temps * longueur > delai:
+            return longueur, temps, taille
+        longueur = min(2 * longueur, len(extrait))
+
+
+def choisir_mode(donnees, budget=None):
+    """
+    Estime la taille et le temps de compression de chaque mode et choisit le meilleur
+    Entrée :
+        - donnees : octets UTF-8 (bytes, mmap ou memoryview) ou texte
+        - budget : temps de compression maximal en secondes
+          (None : FACTEUR_BUDGET fois le temps du mode le plus rapide, au moins BUDGET_MINIMAL)
+    Sortie : dictionnaire de décision, prévu pour être journalisé (tailles estimées en-tête compris)
+        {"mode", "budget", "budget_par_defaut", "entropie", "taux_hors_modele", "taille_arbre",
+         "estimations": {mode: {"taille": octets, "temps": secondes}}}
+    """
+    from .classique import compter_frequences, construire_arbre, generer_codes, serialiser_arbre
+    from .rans import ETATS, PRECISION, modele_appris
+    from .statique import arbre_statique
+
+    if isinstance(donnees, str):
+        donnees = donnees.encode('utf-8')
+    taille_entree = len(donnees)
+    texte = echantillonner(donnees)
+    octets_echantillon = len(texte.encode('utf-8'))
+    # facteur d'extrapolation de l'échantillon au fichier complet
+    facteur = taille_entree / octets_echantillon if octets_echantillon else 0.0
+    nombre_caracteres = len(texte) * facteur
+
+    frequences = compter_frequences(texte)
+    entropie_echantillon = entropie(frequences)
+
+    # statique : longueur exacte des codes fixes, caractères inconnus échappés en UTF-8
+    _, codes_statiques = arbre_statique()
+    bits_statique = 0
+    hors_modele = 0
+    for caractere, frequence in frequences.items():
+        symbole = "<sp>" if caractere == " " else caractere
+        if symbole in codes_statiques:
+            bits_statique += frequence * len(codes_statiques[symbole])
+        else:
+            hors_modele += frequence
+            bits_statique += frequence * (len(codes_statiques["<inconnu>"]) + 8 + 8 * len(caractere.encode('utf-8')))
+
+    # classique : codes de Huffman de l'échantillon, plus l'arbre sérialisé en tête de fichier
+    racine = construire_arbre(frequences)
+    codes = generer_codes(racine)
+    bits_classique = sum(frequence * len(codes[caractere]) for caractere, frequence in frequences.items())
+    bits_arbre = len(serialiser_arbre(racine))
+
+    # rans : coût exact de chaque symbole dans le modèle appris normalisé, plus la table et les états de chaque bloc
+    modele = modele_appris(frequences) if frequences else None
+    bits_rans = 0
+    for caractere, frequence in frequences.items():
+        indice = modele.indices.get(caractere)
+        if indice is None:
+            indice = modele.echappement
+            bits_rans += frequence * 8 * len(caractere.encode('utf-8'))
+        bits_rans += frequence * (PRECISION - math.log2(modele.frequences[indice]))
+    octets_rans = 2 + (len(modele.serialiser()) if modele else 0) + math.ceil(taille_entree / TAILLE_BLOC) * (4 * ETATS + 8)
+
+    tailles = {
+        "statique": bits_statique * facteur / 8,
+        "classique": (bits_classique * facteur + bits_arbre) / 8,
+        "rans": bits_rans * facteur / 8 + octets_rans,
+    }
+    extrait = texte[:TAILLE_MESURE]
+    temps = {mode: mesurer(mode, extrait)[0] * nombre_caracteres for mode in ("statique", "classique", "rans")}
+
+    # adaptatif : pas d'arbre transmis, mais un apprentissage moins efficace que des codes optimaux ;
+    # on applique au classique le rapport de taille observé sur le préfixe sondé
+    longueur_sonde, temps_sonde, taille_sonde = sonder_adaptatif(extrait)
+    prefixe = extrait[:longueur_sonde]
+    taille_classique_prefixe = mesurer("classique", prefixe)[1]
+    rapport = taille_sonde / taille_classique_prefixe if taille_classique_prefixe else 1.0
+    tailles["adaptatif"] = tailles["classique"] * rapport
+    # chaque symbole parcourt et réordonne un arbre qui grandit avec l'alphabet : le temps suit
+    # symboles × alphabet, et non le seul nombre de symboles
+    alphabet_sonde = len(set(prefixe)) or 1
+    temps["adaptatif"] = temps_sonde / alphabet_sonde * nombre_caracteres * len(frequences)
+
+    estimations = {
+        mode: {"taille": TAILLE_ENTETE + 1 + math.ceil(tailles[mode]), "temps": temps[mode]}
+        for mode in MODES
+    }
+
+    budget_par_defaut = budget is None
+    if budget_par_defaut:
+        # compromis par défaut : un mode beaucoup plus lent que le plus rapide n'est retenu que s'il reste
+        # dans un temps absolu modeste
+        budget = max(BUDGET_MINIMAL, FACTEUR_BUDGET * min(estimation["temps"] for estimation in estimations.values()))
+    candidats = [mode for mode in estimations if estimations[mode]["temps"] <= budget]
+    if candidats:
+        plus_petite = min(estimations[m]["taille"] for m in candidats)
+        proches = [m for m in candidats if estimations[m]["taille"] <= plus_petite * (1 + TOLERANCE)]
+        mode = min(proches, key=lambda m: estimations[m]["temps"])
+    else:
+        # aucun mode ne tient dans le budget : on prend le plus rapide
+        mode = min(estimations, key=lambda m: estimations[m]["temps"])
+
+    return {
+        "mode": mode,
+        "budget": budget,
+        "budget_par_defaut": budget_par_defaut,
+        "entropie": entropie_echantillon,
+        "taux_hors_modele": hors_modele / len(texte) if texte else 0.0,
+        "taille_arbre": math.ceil(bits_arbre / 8),
+        "estimations": estimations,
+    }
+
+
+def afficher_decision(decision):
+    """
+    Affiche une décision de choisir_mode sous forme lisible
+    """
+    print(f"Mode choisi : {decision['mode']} (budget {'par défaut ' if decision['budget_par_defaut'] else ''}"
+          f"{decision['budget']:.3f} s)")
+    print(f"  entropie : {decision['entropie']:.3f} bits/caractère, "
+          f"hors modèle statique : {decision['taux_hors_modele']:.1%}, arbre classique : {decision['taille_arbre']} octets")
+    for mode, estimation in decision["estimations"].items():
+        print(f"  {mode:<10} : ~{estimation['taille']} octets, ~{estimation['temps']:.3f} s")
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Lecture et écriture par blocs, communes à tous les codecs
+Les fichiers sont projetés en mémoire (mmap) et la sortie est écrite par blocs de taille fixe :
+aucune étape ne garde de copie complète du fichier
+On y trouve aussi les entiers de taille variable des en-têtes, partagés par les codecs
+"""
+
+import codecs
+import collections
+import contextlib
+import mmap
+import os
+import tempfile
+
+TAILLE_BLOC = 1 << 16  # nombre d'octets lus ou écrits à la fois
+
+
+@contextlib.contextmanager
+def ouvrir_carte(chemin_fichier):
+    """
+    Projette un fichier en mémoire (mmap) en lecture seule.
+    Un fichier vide (que mmap refuse) donne des octets vides.
+    """
+    with open(chemin_fichier, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as carte:
+            yield carte
+
+
+@contextlib.contextmanager
+def ouvrir_vue(chemin_fichier, debut=0, fin=None):
+    """
+    Projette un fichier en mémoire et donne une vue (memoryview) sur ses octets entre debut et fin,
+    sans copie. La vue est libérée avant la fermeture de la projection.
+    """
+    with ouvrir_carte(chemin_fichier) as carte:
+        vue = memoryview(carte)
+        partie = vue[debut:fin]
+        try:
+            yield partie
+        finally:
+            partie.release()
+            vue.release()
+
+
+@contextlib.contextmanager
+def ouvrir_sortie(chemin_fichier, mode='wb', encoding=None):
+    """
+    Ouvre en écriture un fichier temporaire voisin de chemin_fichier, qui le remplace une fois
+    l'écriture terminée. La sortie peut ainsi être le fichier d'entrée lui-même (il n'est pas
+    tronqué sous sa projection en mémoire), et une erreur laisse l'ancien fichier intact.
+    """
+    dossier = os.path.dirname(os.path.abspath(chemin_fichier))
+    descripteur, temporaire = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=dossier)
+    try:
+        # mkstemp crée le fichier en 0600 : on reprend les droits qu'aurait donnés open()
+        masque = os.umask(0)
+        os.umask(masque)
+        os.chmod(temporaire, 0o666 & ~masque)
+        with open(descripteur, mode, encoding=encoding) as fichier:
+            yield fichier
+        os.replace(temporaire, chemin_fichier)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporaire)
+        raise
+
+
+def resultats_en_ordre(executeur, fonction, arguments, en_vol):
+    """
+    Soumet fonction(*a) à un exécuteur pour chaque tuple `a` d'arguments et produit les résultats dans
+    l'ordre, en gardant au plus `en_vol` tâches soumises et non lues : la mémoire occupée par les
+    résultats en attente reste bornée, quel que soit le nombre de tâches.
+    """
+    taches = collections.deque()
+    for argument in arguments:
+        if len(taches) >= en_vol:
+            yield taches.popleft().result()
+        taches.append(executeur.submit(fonction, *argument))
+    while taches:
+        yield taches.popleft().result()
+
+
+def blocs_texte(donnees):
+    """
+    Décode des octets UTF-8 (bytes, mmap ou memoryview) en blocs de texte de taille bornée.
+    Un caractère coupé entre deux blocs est reporté au bloc suivant.
+    """
+    decodeur = codecs.getincrementaldecoder('utf-8')()
+    for debut in range(0, len(donnees), TAILLE_BLOC):
+        bloc = decodeur.decode(donnees[debut:debut + TAILLE_BLOC])
+        if bloc:
+            yield bloc
+    reste = decodeur.decode(b"", final=True)
+    if reste:
+        yield reste
+
+
+def blocs_bits(donnees, position=1, taille=None, position_padding=0):
+    """
+    Convertit des octets compressés en blocs de bits utiles entre `position` et `taille`.
+    L'octet `position_padding` porte la longueur du padding (3 bits de poids faible), retiré en fin de flux.
+    """
+    if len(donnees) == 0:
+        return
+    padding = donnees[position_padding] & 0x07
+    if taille is None:
+        taille = len(donnees)
+    for debut in range(position, taille, TAILLE_BLOC):
+        fin = min(debut + TAILLE_BLOC, taille)
+        octets = donnees[debut:fin]
+        bits = format(int.from_bytes(octets, 'big'), f'0{8 * len(octets)}b')
+        if fin == taille and padding > 0:
+            bits = bits[:-padding]
+        yield bits
+
+
+def ecrire_entier(valeur: int) -> bytes:
+    """
+    Encode un entier positif sur un nombre variable d'octets (7 bits par octet)
+    """
+    octets = bytearray()
+    while valeur >= 0x80:
+        octets.append(valeur & 0x7F | 0x80)
+        valeur >>= 7
+    octets.append(valeur)
+    return bytes(octets)
+
+
+def lire_entier(donnees, position: int):
+    """
+    Décode un entier écrit par ecrire_entier, retourne sa valeur et la position suivante
+    """
+    valeur = 0
+    decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return valeur, position
+        decalage += 7
+
+
+class LecteurBits:
+    """
+    Lit des bits à la demande dans une suite de blocs de bits,
+    sans jamais reconstituer le flux complet.
+    """
+
+    def __init__(self, blocs):
+        self._blocs = iter(blocs)
+        self._bits = ""
+        self._index = 0
+        self.position = 0  # nombre de bits lus depuis le début
+
+    def lire(self, nombre: int) -> str:
+        """Retourne les `nombre` bits suivants (moins si le flux est épuisé)."""
+        if nombre <= 0:
+            return ""
+        while len(self._bits) - self._index < nombre:
+            bloc = next(self._blocs, None)
+            if bloc is None:
+                break
+            self._bits = self._bits[self._index:] + bloc
+            self._index = 0
+        morceau = self._bits[self._index:self._index + nombre]
+        self._index += len(morceau)
+        self.position += len(morceau)
+        return morceau
+
+    def blocs_restants(self):
+        """Retourne les blocs de bits non encore lus, à commencer par le reste du tampon."""
+        reste = self._bits[self._index:]
+        self._bits = ""
+        self._index = 0
+        if reste:
+            yield reste
+        yield from self._blocs
+
+
+class EcrivainBits:
+    """
+    Accumule des chaînes de bits et écrit les octets complets dans un fichier binaire
+    par blocs de TAILLE_BLOC octets.
+    """
+
+    def __init__(self, fichier):
+        self._fichier = fichier
+        self._morceaux = []
+        self._longueur = 0
+
+    def ecrire(self, bits: str):
+        self._morceaux.append(bits)
+        self._longueur += len(bits)
+        if self._longueur >= 8 * TAILLE_BLOC:
+            self.vider()
+
+    def vider(self):
+        """Écrit tous les octets complets, les bits restants restent en attente."""
+        bits = "".join(self._morceaux)
+        longueur_complete = len(bits) - len(bits) % 8
+        if longueur_complete > 0:
+            self._fichier.write(int(bits[:longueur_complete], 2).to_bytes(longueur_complete // 8, 'big'))
+        self._morceaux = [bits[longueur_complete:]]
+        self._longueur = len(bits) - longueur_complete
+
+    def terminer(self) -> int:
+        """Complète le dernier octet avec des zéros, l'écrit et retourne la longueur du padding."""
+        self.vider()
+        padding = (8 - self._longueur % 8) % 8
+        if self._longueur > 0:
+            self._fichier.write(bytes([int(self._morceaux[0] + "0" * padding, 2)]))
+        self._morceaux = []
+        self._longueur = 0
+        return padding
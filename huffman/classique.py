@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+"""Huffman classique : arbre construit à partir du texte et inclus dans le fichier compressé."""
+
+import argparse
+import heapq
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+from itertools import chain, zip_longest
+
+from .blocs import TAILLE_BLOC, EcrivainBits, LecteurBits, blocs_bits, blocs_texte, ouvrir_vue
+from .conteneur import ErreurFormat
+
+# Découpage du texte en jetons pour le mode "mots" : mots, suites d'espaces, ponctuation
+MOTIF_JETONS = re.compile(r"\w+|\s+|[^\w\s]")
+# Un jeton de plusieurs caractères apparaissant moins de SEUIL_MOTS fois est découpé en caractères
+SEUIL_MOTS = 2
+# Longueur maximale d'un jeton reporté d'un bloc au suivant ; au-delà (jeton déjà échappé,
+# car plus long que 255 octets), il est coupé pour que le report ne grossisse pas indéfiniment
+REPORT_MAX = 256
+# Bit du premier octet indiquant des données réparties en plusieurs sous-flux entrelacés
+DRAPEAU_MULTI_FLUX = 0x08
+# Bit du premier octet indiquant une trame sans arbre, codée avec l'arbre de la trame classique précédente
+DRAPEAU_ARBRE_PRECEDENT = 0x10
+
+
+class Noeud:
+    def __init__(self, frequence=0, caractere=None, gauche=None, droite=None):
+        # Un nœud de l'arbre de Huffman, contenant un caractère, sa fréquence
+        # et des références aux sous-arbres gauche et droit
+        self.caractere = caractere
+        self.frequence = frequence
+        self.gauche = gauche
+        self.droite = droite
+
+
+def compter_frequences(texte, frequences=None):
+    """Compte les fréquences des symboles (caractères ou jetons) d'un texte."""
+    # Crée (ou complète) un dictionnaire où chaque symbole est une clé et sa fréquence est la valeur
+    if frequences is None:
+        frequences = {}
+    # Counter compte en C ; l'ordre de première apparition (qui départage l'arbre) est conservé
+    for caractere, frequence in Counter(texte).items():
+        frequences[caractere] = frequences.get(caractere, 0) + frequence
+    return frequences
+
+
+def jeton_echappe(jeton, frequences_jetons, seuil):
+    """Indique si un jeton est trop rare (ou trop long pour l'en-tête) pour entrer dans l'alphabet."""
+    return len(jeton) > 1 and (frequences_jetons[jeton] < seuil or len(jeton.encode("utf-8")) > 255)
+
+
+def appliquer_seuil(jetons, frequences_jetons, seuil=SEUIL_MOTS):
+    """Remplace les jetons rares par leurs caractères (échappement du mode mots)."""
+    symboles = []
+    for jeton in jetons:
+        if jeton_echappe(jeton, frequences_jetons, seuil):
+            symboles.extend(jeton)
+        else:
+            symboles.append(jeton)
+    return symboles
+
+
+def frequences_symboles(frequences_jetons, seuil=SEUIL_MOTS):
+    """Déduit les fréquences des symboles après échappement des fréquences des jetons."""
+    frequences = {}
+    for jeton, frequence in frequences_jetons.items():
+        for symbole in (jeton if jeton_echappe(jeton, frequences_jetons, seuil) else [jeton]):
+            frequences[symbole] = frequences.get(symbole, 0) + frequence
+    return frequences
+
+
+def table_jetons(frequences_jetons, table_codes, echappe):
+    """Calcule une seule fois les codes des symboles de chaque jeton : le sien, ou ceux de ses caractères s'il est échappé."""
+    return {jeton: tuple(table_codes[symbole] for symbole in (jeton if echappe(jeton) else (jeton,)))
+            for jeton in frequences_jetons}
+
+
+def decouper_jetons(texte, seuil=SEUIL_MOTS):
+    """Découpe un texte en jetons (mots, espaces, ponctuation) pour le mode mots."""
+    jetons = MOTIF_JETONS.findall(texte)
+    return appliquer_seuil(jetons, compter_frequences(jetons), seuil)
+
+
+def decouper_blocs(blocs):
+    """Découpe une suite de blocs de texte en listes de jetons, un jeton pouvant chevaucher deux blocs."""
+    reste = ""
+    for bloc in blocs:
+        jetons = MOTIF_JETONS.findall(reste + bloc)
+        # Le dernier jeton peut continuer dans le bloc suivant : il est reporté
+        reste = jetons.pop() if jetons else ""
+        if len(reste) > REPORT_MAX:
+            jetons.append(reste)
+            reste = ""
+        yield jetons
+    if reste:
+        yield [reste]
+
+
+def construire_arbre(dictionnaire_frequences):
+    """Construit l'arbre de Huffman à partir d'un dictionnaire de fréquences."""
+    # Crée une liste de nœuds à partir des fréquences des caractères
+    liste_noeuds = [Noeud(frequence=f, caractere=c) for c, f in dictionnaire_frequences.items() if f > 0]
+
+    # cas spéciaux
+    if not liste_noeuds:
+        # Si aucun caractère n'est présent, retourne None
+        return None
+    if len(liste_noeuds) == 1:
+        # Si un seul caractère est présent, retourne ce nœud comme racine
+        return liste_noeuds[0]
+
+    # File de priorité (fréquence, ordre d'insertion, nœud) : l'ordre d'insertion départage
+    # les égalités, ce qui évite de retrier toute la liste quand l'alphabet est grand (mode mots)
+    file = [(noeud.frequence, ordre, noeud) for ordre, noeud in enumerate(liste_noeuds)]
+    heapq.heapify(file)
+    ordre = len(file)
+
+    # Combine les deux nœuds de plus faible fréquence jusqu'à ce qu'il ne reste qu'un seul nœud
+    while len(file) > 1:
+        _, _, a = heapq.heappop(file)  # Nœud avec la plus petite fréquence
+        _, _, b = heapq.heappop(file)  # Deuxième plus petite fréquence
+
+        # Crée un nœud parent avec la somme des fréquences
+        parent = Noeud(frequence=a.frequence + b.frequence, gauche=a, droite=b)
+        heapq.heappush(file, (parent.frequence, ordre, parent))
+        ordre += 1
+
+    return file[0][2]  # Le dernier nœud est la racine de l'arbre
+
+
+def generer_codes(noeud, prefixe="", table=None):
+    """Génère un dictionnaire de codes binaires à partir de l'arbre de Huffman."""
+    if table is None:
+        table = {}
+
+    if noeud is None:
+        return table
+
+    if noeud.caractere is not None:
+        # Si le nœud est une feuille, associe le caractère au code binaire
+        table[noeud.caractere] = prefixe if prefixe else "0"
+    else:
+        # Parcours récursif des sous-arbres gauche et droit
+        if noeud.gauche:
+            generer_codes(noeud.gauche, prefixe + "0", table)
+        if noeud.droite:
+            generer_codes(noeud.droite, prefixe + "1", table)
+
+    return table
+
+
+def serialiser_arbre(noeud):
+    """Sérialise l'arbre de Huffman en une chaîne de bits."""
+    if noeud is None:
+        return ""
+
+    if noeud.caractere is not None:
+        # Sérialise une feuille : "1" suivi de la longueur et des bits du caractère
+        encodage = noeud.caractere.encode("utf-8")
+        longueur_symbole = format(len(encodage), "08b")
+        bits_symbole = "".join(f"{octet:08b}" for octet in encodage)
+        return "1" + longueur_symbole + bits_symbole
+
+    # Sérialise récursivement les sous-arbres gauche et droit
+    gauche_bits = serialiser_arbre(noeud.gauche) if noeud.gauche else ""
+    droite_bits = serialiser_arbre(noeud.droite) if noeud.droite else ""
+    return "0" + gauche_bits + droite_bits
+
+
+def deserialiser_arbre(lecteur):
+    """Désérialise un arbre de Huffman en lisant ses bits dans un LecteurBits."""
+    bit_courant = lecteur.lire(1)
+    if not bit_courant:
+        return None
+
+    if bit_courant == "1":
+        # Désérialise une feuille : lit la longueur et les bits du caractère
+        longueur = int(lecteur.lire(8), 2)
+        symbole_bits = lecteur.lire(longueur * 8)
+        symbole = bytes(int(symbole_bits[i:i + 8], 2) for i in range(0, len(symbole_bits), 8)).decode("utf-8")
+        return Noeud(caractere=symbole)
+    else:
+        # Désérialise récursivement les sous-arbres gauche et droit
+        gauche = deserialiser_arbre(lecteur)
+        droite = deserialiser_arbre(lecteur)
+        return Noeud(gauche=gauche, droite=droite)
+
+
+def encoder(texte, table_codes):
+    """Encode un texte (ou une liste de jetons) en une chaîne de bits selon une table de codes."""
+    # Remplace chaque symbole par son code binaire
+    return ''.join(map(table_codes.__getitem__, texte))
+
+
+def decoder(bits, racine):
+    """Décode une chaîne de bits en texte à l'aide de l'arbre de Huffman."""
+    return "".join(decoder_blocs([bits], racine))
+
+
+def decoder_blocs(blocs, racine):
+    """Décode une suite de blocs de bits, en produisant le texte décodé bloc par bloc."""
+    for symboles in decoder_symboles(blocs, racine):
+        yield "".join(symboles)
+
+
+def decoder_symboles(blocs, racine, nombre=None):
+    """Décode une suite de blocs de bits en listes de symboles, en s'arrêtant après `nombre` symboles."""
+    if not racine:
+        return
+
+    noeud_courant = racine
+    for bits in blocs:
+        if racine.caractere is not None:
+            # Arbre réduit à une feuille : chaque bit "0" code le seul symbole
+            resultat = [racine.caractere] * len(bits)
+        else:
+            resultat = []
+            for bit in bits:
+                # Parcours l'arbre selon les bits (0 = gauche, 1 = droite)
+                noeud_courant = noeud_courant.gauche if bit == "0" else noeud_courant.droite
+                if noeud_courant.caractere is not None:
+                    # Si une feuille est atteinte, ajoute le caractère au résultat
+                    resultat.append(noeud_courant.caractere)
+                    noeud_courant = racine
+
+        if nombre is not None:
+            # Le padding final peut produire des symboles en trop : on les ignore
+            resultat = resultat[:nombre]
+            nombre -= len(resultat)
+        yield resultat
+        if nombre == 0:
+            return
+
+
+def cout_arbre_precedent(frequences_jetons, table_codes, mots=False):
+    """Taille en bits du texte codé avec une table existante, ou None si un symbole y manque.
+
+    En mode mots, un jeton absent de la table est découpé en caractères, comme un jeton rare.
+    """
+    cout = 0
+    for jeton, frequence in frequences_jetons.items():
+        if jeton in table_codes:
+            cout += frequence * len(table_codes[jeton])
+        elif mots and all(caractere in table_codes for caractere in jeton):
+            cout += frequence * sum(len(table_codes[caractere]) for caractere in jeton)
+        else:
+            return None
+    return cout
+
+
+def compresser_flux(fournir_blocs, fichier_sortie, mots=False, seuil=SEUIL_MOTS, flux=1, arbre_precedent=None):
+    """Compresse des blocs de texte dans un fichier binaire, en deux passes et sans copie complète.
+
+    fournir_blocs est appelée une fois par passe et doit retourner un nouvel itérable de blocs.
+    Avec flux > 1, les symboles sont répartis à tour de rôle entre plusieurs sous-flux
+    qui partagent le même arbre et peuvent être décodés indépendamment.
+    Avec arbre_precedent (arbre de la trame précédente d'un fichier), l'arbre n'est pas réécrit
+    si tous les symboles y figurent et que le texte n'en est pas plus long (un seul flux).
+    """
+    def symboles_par_blocs():
+        # En mode mots, l'alphabet est constitué de jetons : l'arbre et l'en-tête
+        # restent identiques, seul le découpage change
+        return decouper_blocs(fournir_blocs()) if mots else fournir_blocs()
+
+    # Première passe : fréquences
+    frequences = {}
+    for symboles in symboles_par_blocs():
+        compter_frequences(symboles, frequences)
+    frequences_jetons = frequences
+    if mots:
+        frequences = frequences_symboles(frequences_jetons, seuil)
+
+    if not frequences:
+        # Texte vide : la sortie reste vide
+        return
+
+    # Étapes de la compression : fréquences -> arbre -> codes -> bits -> octets
+    racine = construire_arbre(frequences)
+    table_codes = generer_codes(racine)
+
+    if arbre_precedent is not None and flux == 1:
+        codes_precedents = generer_codes(arbre_precedent)
+        cout_precedent = cout_arbre_precedent(frequences_jetons, codes_precedents, mots)
+        cout_nouveau = sum(frequence * len(table_codes[symbole]) for symbole, frequence in frequences.items())
+        if cout_precedent is not None and cout_precedent <= cout_nouveau + len(serialiser_arbre(racine)):
+            if mots:
+                # Les jetons absents de la table sont découpés en caractères
+                codes_precedents = table_jetons(frequences_jetons, codes_precedents,
+                                                lambda jeton: jeton not in codes_precedents)
+                codes_precedents = {jeton: "".join(codes) for jeton, codes in codes_precedents.items()}
+            compresser_arbre_precedent(symboles_par_blocs, fichier_sortie, codes_precedents)
+            return
+
+    if mots:
+        # Table jeton -> codes de ses symboles, pour un seul accès par jeton à la seconde passe
+        codes_jetons = table_jetons(frequences_jetons, table_codes,
+                                    lambda jeton: jeton_echappe(jeton, frequences_jetons, seuil))
+
+    if flux > 1:
+        compresser_multi_flux(symboles_par_blocs, fichier_sortie, racine, table_codes, flux,
+                              codes_jetons if mots else None)
+        return
+
+    # Le premier octet (taille du padding) est réservé puis réécrit à la fin
+    position_padding = fichier_sortie.tell()
+    fichier_sortie.write(b"\0")
+    ecrivain = EcrivainBits(fichier_sortie)
+    ecrivain.ecrire(serialiser_arbre(racine))
+
+    # Seconde passe : encodage bloc par bloc
+    if mots:
+        table_codes = {jeton: "".join(codes) for jeton, codes in codes_jetons.items()}
+    for symboles in symboles_par_blocs():
+        ecrivain.ecrire(encoder(symboles, table_codes))
+    padding = ecrivain.terminer()
+
+    fichier_sortie.seek(position_padding)
+    fichier_sortie.write(bytes([padding]))
+    fichier_sortie.seek(0, os.SEEK_END)
+
+
+def compresser_arbre_precedent(symboles_par_blocs, fichier_sortie, table_codes):
+    """Écrit une trame sans arbre : octet DRAPEAU_ARBRE_PRECEDENT (et padding), puis le texte codé."""
+    position_padding = fichier_sortie.tell()
+    fichier_sortie.write(bytes([DRAPEAU_ARBRE_PRECEDENT]))
+    ecrivain = EcrivainBits(fichier_sortie)
+    for symboles in symboles_par_blocs():
+        ecrivain.ecrire(encoder(symboles, table_codes))
+    padding = ecrivain.terminer()
+
+    fichier_sortie.seek(position_padding)
+    fichier_sortie.write(bytes([DRAPEAU_ARBRE_PRECEDENT | padding]))
+    fichier_sortie.seek(0, os.SEEK_END)
+
+
+def compresser_multi_flux(symboles_par_blocs, fichier_sortie, racine, table_codes, flux, codes_jetons=None):
+    """Écrit l'arbre puis `flux` sous-flux entrelacés (le symbole i va dans le sous-flux i % flux).
+
+    En mode mots, codes_jetons (voir table_jetons) donne les codes des symboles de chaque jeton.
+
+    Format : octet DRAPEAU_MULTI_FLUX, arbre complété à l'octet, nombre de sous-flux (1 octet),
+    nombre total de symboles (8 octets), taille en octets de chaque sous-flux (8 octets chacune),
+    puis les sous-flux, chacun complété à l'octet.
+    """
+    fichier_sortie.write(bytes([DRAPEAU_MULTI_FLUX]))
+    ecrivain = EcrivainBits(fichier_sortie)
+    ecrivain.ecrire(serialiser_arbre(racine))
+    ecrivain.terminer()
+
+    # Les sous-flux sont écrits dans des fichiers temporaires, puis recopiés après la table des tailles
+    temporaires = [tempfile.TemporaryFile() for _ in range(flux)]
+    try:
+        ecrivains = [EcrivainBits(temporaire) for temporaire in temporaires]
+        nombre_symboles = 0
+        for symboles in symboles_par_blocs():
+            if codes_jetons is not None:
+                codes = list(chain.from_iterable(map(codes_jetons.__getitem__, symboles)))
+            else:
+                codes = list(map(table_codes.__getitem__, symboles))
+            for indice, ecrivain in enumerate(ecrivains):
+                ecrivain.ecrire("".join(codes[(indice - nombre_symboles) % flux::flux]))
+            nombre_symboles += len(codes)
+        for ecrivain in ecrivains:
+            ecrivain.terminer()
+
+        fichier_sortie.write(bytes([flux]))
+        fichier_sortie.write(nombre_symboles.to_bytes(8, "big"))
+        for temporaire in temporaires:
+            fichier_sortie.write(temporaire.tell().to_bytes(8, "big"))
+        for temporaire in temporaires:
+            temporaire.seek(0)
+            shutil.copyfileobj(temporaire, fichier_sortie, TAILLE_BLOC)
+    finally:
+        for temporaire in temporaires:
+            temporaire.close()
+
+
+def lire_multi_flux(donnees):
+    """Lit l'en-tête d'un fichier multi-flux : arbre, nombre de symboles et (début, fin, nombre) de chaque sous-flux."""
+    lecteur = LecteurBits(blocs_bits(donnees))
+    racine = deserialiser_arbre(lecteur)
+    position = 1 + (lecteur.position + 7) // 8
+
+    flux = donnees[position]
+    nombre_symboles = int.from_bytes(donnees[position + 1:position + 9], "big")
+    position += 9
+    tailles = [int.from_bytes(donnees[position + 8 * i:position + 8 * i + 8], "big") for i in range(flux)]
+    position += 8 * flux
+
+    sous_flux = []
+    for indice, taille in enumerate(tailles):
+        # Le sous-flux i contient les symboles i, i + flux, i + 2 * flux...
+        sous_flux.append((position, position + taille, (nombre_symboles - indice + flux - 1) // flux))
+        position += taille
+    return racine, sous_flux
+
+
+def decoder_sous_flux(donnees, racine, debut, fin, nombre):
+    """Décode un sous-flux en un itérateur de symboles."""
+    return chain.from_iterable(decoder_symboles(blocs_bits(donnees, debut, fin), racine, nombre))
+
+
+def decoder_fenetre_fichier(emplacement, indice, bit_debut, nombre):
+    """Décode `nombre` symboles du sous-flux `indice` d'un fichier à partir du bit `bit_debut`
+    (utilisé par les processus de décompression parallèle).
+
+    Retourne le texte des symboles, la longueur de chacun (None s'ils font tous un caractère)
+    et la position du bit qui suit le dernier symbole, où commence la fenêtre suivante.
+    """
+    with ouvrir_vue(*emplacement) as donnees:
+        racine, sous_flux = lire_multi_flux(donnees)
+        debut, fin, _ = sous_flux[indice]
+        if racine.caractere is not None:
+            # Arbre réduit à une feuille : un bit par symbole
+            return racine.caractere * nombre, None, bit_debut + nombre
+
+        octet, decalage = divmod(bit_debut, 8)
+        blocs = blocs_bits(donnees, debut + octet, fin)
+        bits = chain.from_iterable(blocs)
+        for _ in range(decalage):
+            next(bits)
+        symboles = []
+        noeud_courant = racine
+        position = bit_debut
+        for bit in bits:
+            position += 1
+            noeud_courant = noeud_courant.gauche if bit == "0" else noeud_courant.droite
+            if noeud_courant.caractere is not None:
+                symboles.append(noeud_courant.caractere)
+                if len(symboles) == nombre:
+                    break
+                noeud_courant = racine
+        # le générateur garde une vue sur le fichier : il est fermé avant la projection
+        blocs.close()
+
+    texte = "".join(symboles)
+    longueurs = None if len(texte) == len(symboles) else list(map(len, symboles))
+    return texte, longueurs, position
+
+
+def separer_symboles(texte, longueurs):
+    """Redécoupe en symboles le texte d'une fenêtre renvoyé par decoder_fenetre_fichier."""
+    if longueurs is None:
+        return list(texte)
+    symboles = []
+    position = 0
+    for longueur in longueurs:
+        symboles.append(texte[position:position + longueur])
+        position += longueur
+    return symboles
+
+
+def decoder_sous_flux_paralleles(executeur, emplacement, sous_flux, fenetre):
+    """Décode les sous-flux en parallèle, fenêtre par fenêtre, et produit le texte entrelacé.
+
+    Chaque sous-flux est découpé en fenêtres de `fenetre` symboles, décodées l'une après l'autre
+    (une fenêtre commence au bit où s'arrête la précédente) ; seules la fenêtre en cours de décodage
+    et la dernière fenêtre décodée de chaque sous-flux sont en mémoire.
+    """
+    restants = [nombre for _, _, nombre in sous_flux]
+    taches = [executeur.submit(decoder_fenetre_fichier, emplacement, indice, 0, min(fenetre, restant))
+              if restant else None
+              for indice, restant in enumerate(restants)]
+    while any(taches):
+        fenetres = []
+        for indice, tache in enumerate(taches):
+            if tache is None:
+                continue
+            texte, longueurs, position = tache.result()
+            fenetres.append(separer_symboles(texte, longueurs))
+            restants[indice] -= len(fenetres[-1])
+            # la fenêtre suivante est lancée avant d'entrelacer celle-ci
+            taches[indice] = (executeur.submit(decoder_fenetre_fichier, emplacement, indice, position,
+                                               min(fenetre, restants[indice]))
+                              if restants[indice] else None)
+        yield from entrelacer(fenetres)
+
+
+def entrelacer(flux_symboles):
+    """Reconstitue le texte à partir des sous-flux de symboles, par morceaux d'environ TAILLE_BLOC symboles."""
+    morceau = []
+    for groupe in zip_longest(*flux_symboles, fillvalue=""):
+        morceau.extend(groupe)
+        if len(morceau) >= TAILLE_BLOC:
+            yield "".join(morceau)
+            morceau = []
+    yield "".join(morceau)
+
+
+def arbre_trame(donnees, arbre_precedent=None):
+    """Retourne l'arbre en vigueur dans une trame : le sien, ou celui de la trame précédente qu'elle réutilise."""
+    if len(donnees) == 0 or donnees[0] & DRAPEAU_ARBRE_PRECEDENT:
+        return arbre_precedent
+    if donnees[0] & DRAPEAU_MULTI_FLUX:
+        return lire_multi_flux(donnees)[0]
+    return deserialiser_arbre(LecteurBits(blocs_bits(donnees)))
+
+
+def compresser_donnees(donnees, fichier_sortie, mots=False, seuil=SEUIL_MOTS, flux=1, arbre_precedent=None):
+    """Compresse des octets UTF-8 (bytes, mmap ou memoryview) dans un fichier binaire."""
+    compresser_flux(lambda: blocs_texte(donnees), fichier_sortie, mots, seuil, flux, arbre_precedent)
+
+
+def decompresser_donnees(donnees, emplacement=None, processus=1, depuis=0, arbre_precedent=None):
+    """Décompresse des octets produits par compresser_donnees, en produisant le texte bloc par bloc.
+
+    Les sous-flux d'un fichier multi-flux sont décodés en parallèle si `processus` > 1 ; il faut alors
+    l'emplacement (chemin, début, fin) des données dans un fichier, que chaque processus relit lui-même.
+    Une trame sans arbre est décodée avec arbre_precedent. `depuis` n'a pas de sens ici et est ignoré.
+    """
+    if len(donnees) == 0:
+        return
+    if donnees[0] & DRAPEAU_ARBRE_PRECEDENT:
+        if arbre_precedent is None:
+            raise ErreurFormat("trame qui réutilise l'arbre de la trame précédente, mais aucune trame classique ne la précède")
+        yield from decoder_blocs(blocs_bits(donnees), arbre_precedent)
+        return
+    if not donnees[0] & DRAPEAU_MULTI_FLUX:
+        lecteur = LecteurBits(blocs_bits(donnees))
+        racine = deserialiser_arbre(lecteur)
+        yield from decoder_blocs(lecteur.blocs_restants(), racine)
+        return
+
+    racine, sous_flux = lire_multi_flux(donnees)
+    if processus > 1 and emplacement is not None:
+        # Import tardif : inutile de charger multiprocessing pour un décodage séquentiel
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Fenêtres de quelques blocs, partagées entre les sous-flux : la mémoire reste en O(processus × TAILLE_BLOC)
+        fenetre = max(TAILLE_BLOC, 4 * TAILLE_BLOC * processus // len(sous_flux))
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            yield from decoder_sous_flux_paralleles(executeur, emplacement, sous_flux, fenetre)
+        return
+    # Décodage par lots : chaque sous-flux avance d'un bloc à la fois
+    yield from entrelacer([decoder_sous_flux(donnees, racine, *description) for description in sous_flux])
+
+
+def comparer_modes(chemin_entree, seuil=SEUIL_MOTS, flux=1):
+    """Compare le mode caractères et le mode mots (taille et débit) sur un fichier."""
+    from . import compress, decompress
+
+    with open(chemin_entree, "r", encoding="utf-8") as fichier:
+        texte = fichier.read()
+
+    taille_originale = len(texte.encode("utf-8"))
+    print(f"Fichier : {chemin_entree} ({taille_originale} octets)")
+    modes = [("caractères", False), ("mots", True)]
+    if flux > 1:
+        modes += [(f"car. x{flux}", False), (f"mots x{flux}", True)]
+    for nom, mots in modes:
+        debut = time.perf_counter()
+        octets = compress(texte, "classique", mots=mots, seuil=seuil, flux=flux if " x" in nom else 1)
+        milieu = time.perf_counter()
+        resultat = decompress(octets)
+        fin = time.perf_counter()
+        assert resultat == texte, f"aller-retour incorrect en mode {nom}"
+
+        taux = len(octets) / taille_originale if taille_originale else 0
+        print(f"  mode {nom:<10} : {len(octets):>8} octets ({taux:.1%}), "
+              f"compression {milieu - debut:.3f} s, décompression {fin - milieu:.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compression Huffman classique (avec arbre inclus)")
+    parser.add_argument("-e", metavar="input", help="Fichier à compresser")
+    parser.add_argument("-d", metavar="input", help="Fichier à décompresser")
+    parser.add_argument("-b", metavar="input", help="Compare les modes caractères et mots sur un fichier")
+    parser.add_argument("-o", metavar="output", help="Fichier de sortie")
+    parser.add_argument("--mots", action="store_true", help="Encode par mots/jetons plutôt que par caractères")
+    parser.add_argument("--seuil", type=int, default=SEUIL_MOTS,
+                        help="Fréquence minimale d'un jeton en mode mots (sinon découpé en caractères)")
+    parser.add_argument("--flux", type=int, default=1,
+                        help="Répartit les symboles entre N sous-flux entrelacés décodables en parallèle")
+    parser.add_argument("--processus", type=int, default=1,
+                        help="Nombre de processus pour décoder les sous-flux d'un fichier multi-flux")
+    args = parser.parse_args()
+
+    if not 1 <= args.flux <= 255:
+        parser.error("le nombre de sous-flux doit être compris entre 1 et 255")
+
+    from . import compresser_fichier, decompresser_fichier
+
+    if args.b:
+        comparer_modes(args.b, args.seuil, args.flux)
+    elif not args.o:
+        parser.error("l'option -o est requise pour -e et -d")
+    elif args.e:
+        compresser_fichier(args.e, args.o, "classique", mots=args.mots, seuil=args.seuil, flux=args.flux)
+    elif args.d:
+        # Les fichiers sans en-tête (anciennes versions) sont lus comme du Huffman classique
+        decompresser_fichier(args.d, args.o, mode="classique", processus=args.processus)
+    else:
+        parser.print_help()
+        print("\nSpécifiez soit -e (encode), soit -d (decode).")
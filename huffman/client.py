@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Client du démon de compression (huffman.demon), avec un groupe de connexions réutilisées
+
+    >>> from huffman.client import Client
+    >>> with Client("/tmp/huffman.sock") as client:           # doctest: +SKIP
+    ...     trame = client.compress("le horla", mode="classique")
+    ...     client.decompress(trame)
+    'le horla'
+
+Le client est utilisable depuis plusieurs fils d'exécution : chaque requête emprunte une connexion
+libre (ou en ouvre une, dans la limite de `connexions`) et la rend une fois la réponse lue.
+
+Banc d'essai contre un processus par requête :
+    python3 -m huffman.client -b le-horla.txt [--requetes N] [--taille OCTETS] [--mode MODE]
+"""
+
+import argparse
+import os
+import queue
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .conteneur import MODES
+from .demon import COMPRESSION, DECOMPRESSION, ENTETE_REPONSE, STATUT_SUCCES, coder_requete
+
+
+class ErreurDemon(RuntimeError):
+    """Requête refusée par le démon (données illisibles, option invalide...) : porte son message d'erreur."""
+
+
+class Client:
+    """
+    Connexions à un démon de compression, sur une socket Unix (chemin) ou en TCP (port)
+    """
+
+    def __init__(self, chemin_socket=None, port=None, hote="127.0.0.1", connexions=4, delai=None):
+        if (chemin_socket is None) == (port is None):
+            raise ValueError("indiquez soit le chemin d'une socket Unix, soit un port TCP")
+        self._chemin_socket = chemin_socket
+        self._adresse = (hote, port)
+        self._delai = delai
+        self._libres = queue.LifoQueue()
+        self._places = threading.BoundedSemaphore(connexions)
+
+    def _connecter(self):
+        if self._chemin_socket is not None:
+            connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            adresse = self._chemin_socket
+        else:
+            connexion = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            connexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            adresse = self._adresse
+        connexion.settimeout(self._delai)
+        connexion.connect(adresse)
+        return connexion
+
+    def _requete(self, requete) -> bytes:
+        """Envoie une requête tramée sur une connexion du groupe et retourne le corps de la réponse."""
+        with self._places:
+            try:
+                connexion = self._libres.get_nowait()
+            except queue.Empty:
+                connexion = self._connecter()
+            try:
+                connexion.sendall(requete)
+                statut, taille = ENTETE_REPONSE.unpack(lire_exactement(connexion, ENTETE_REPONSE.size))
+                corps = lire_exactement(connexion, taille)
+            except BaseException:
+                # état de la connexion inconnu : elle n'est pas remise dans le groupe
+                connexion.close()
+                raise
+            self._libres.put(connexion)
+
+        if statut != STATUT_SUCCES:
+            raise ErreurDemon(corps.decode('utf-8', errors='replace'))
+        return corps
+
+    def compress(self, data, mode="classique", **options) -> bytes:
+        """
+        Compresse un texte (str ou bytes UTF-8) via le démon, mêmes options que huffman.compress
+        """
+        return self._requete(coder_requete(COMPRESSION, mode, options, data))
+
+    def decompress(self, data, mode=None, **options) -> str:
+        """
+        Décompresse une trame via le démon, mêmes options que huffman.decompress
+        """
+        return self._requete(coder_requete(DECOMPRESSION, mode, options, data)).decode('utf-8')
+
+    def fermer(self):
+        """Ferme les connexions libres du groupe."""
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.fermer()
+
+
+def lire_exactement(connexion, taille) -> bytes:
+    """Lit exactement `taille` octets sur une socket."""
+    morceaux = []
+    while taille > 0:
+        morceau = connexion.recv(min(taille, 1 << 20))
+        if not morceau:
+            raise ConnectionError("connexion fermée par le démon")
+        morceaux.append(morceau)
+        taille -= len(morceau)
+    return b"".join(morceaux)
+
+
+def resumer(nom, durees, total):
+    """Affiche médiane, 99e centile et débit d'une série de durées (en secondes)."""
+    durees = sorted(durees)
+    p50 = durees[len(durees) // 2]
+    p99 = durees[min(len(durees) - 1, int(len(durees) * 0.99))]
+    print(f"  {nom:<28} : p50 {p50 * 1000:8.2f} ms, p99 {p99 * 1000:8.2f} ms, "
+          f"{len(durees) / total:8.1f} requêtes/s")
+
+
+def banc_essai(chemin_entree, requetes=200, taille=2048, mode="classique", processus=None, connexions=4):
+    """
+    Compare la latence (p50, p99) et le débit de petites requêtes de compression :
+    un processus `python3 -m huffman` par requête, puis le démon (requêtes en série,
+    puis `connexions` clients simultanés)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with open(chemin_entree, "rb") as fichier:
+        texte = fichier.read(taille).decode('utf-8', errors='ignore')
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environnement = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [racine, os.environ.get("PYTHONPATH")])))
+    print(f"{requetes} requêtes de compression ({mode}) de {len(texte.encode('utf-8'))} octets")
+
+    with tempfile.TemporaryDirectory() as dossier:
+        entree = os.path.join(dossier, "entree.txt")
+        with open(entree, "w", encoding="utf-8") as fichier:
+            fichier.write(texte)
+
+        # un interpréteur par requête, comme lorsqu'on appelle la ligne de commande
+        durees = []
+        debut = time.perf_counter()
+        for _ in range(requetes):
+            depart = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "huffman", "-e", entree, "-o", os.path.join(dossier, "sortie.huf"),
+                            "--mode", mode], check=True, stdout=subprocess.DEVNULL, env=environnement)
+            durees.append(time.perf_counter() - depart)
+        resumer("processus par requête", durees, time.perf_counter() - debut)
+
+        chemin_socket = os.path.join(dossier, "huffman.sock")
+        commande = [sys.executable, "-m", "huffman.demon", "--socket", chemin_socket]
+        if processus:
+            commande += ["--processus", str(processus)]
+        demon = subprocess.Popen(commande, stdout=subprocess.PIPE, env=environnement, text=True)
+        try:
+            demon.stdout.readline()  # « En écoute sur ... » : le démon est prêt
+            with Client(chemin_socket, connexions=connexions) as client:
+                def mesurer():
+                    depart = time.perf_counter()
+                    client.compress(texte, mode)
+                    return time.perf_counter() - depart
+
+                mesurer()  # ouvre une première connexion
+                debut = time.perf_counter()
+                durees = [mesurer() for _ in range(requetes)]
+                resumer("démon, en série", durees, time.perf_counter() - debut)
+
+                with ThreadPoolExecutor(max_workers=connexions) as fils:
+                    debut = time.perf_counter()
+                    durees = list(fils.map(lambda _: mesurer(), range(requetes)))
+                    resumer(f"démon, {connexions} clients", durees, time.perf_counter() - debut)
+        finally:
+            demon.terminate()
+            demon.wait()
+
+
+def main():
+    analyseur = argparse.ArgumentParser(prog="python3 -m huffman.client",
+                                        description="Banc d'essai du démon de compression")
+    analyseur.add_argument("-b", metavar="fichier_entree", required=True,
+                           help="Fichier dont le début sert de requête")
+    analyseur.add_argument("--requetes", metavar="N", type=int, default=200, help="Nombre de requêtes par série")
+    analyseur.add_argument("--taille", metavar="OCTETS", type=int, default=2048, help="Taille de chaque requête")
+    analyseur.add_argument("--mode", choices=list(MODES), default="classique", help="Mode de compression des requêtes")
+    analyseur.add_argument("--processus", metavar="P", type=int, help="Nombre de processus du démon")
+    analyseur.add_argument("--connexions", metavar="C", type=int, default=4, help="Clients simultanés")
+    arguments = analyseur.parse_args()
+
+    banc_essai(arguments.b, arguments.requetes, arguments.taille, arguments.mode,
+               arguments.processus, arguments.connexions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+En-tête commun aux fichiers compressés : il identifie le format et le codec utilisé,
+ce qui permet au décodeur de choisir le mode tout seul
+
+Trame : MAGIE (3 octets), VERSION (1 octet), code du mode (1 octet),
+taille des données compressées (8 octets), puis les données du codec
+Un fichier peut contenir plusieurs trames à la suite : la taille de chacune mène à la suivante
+"""
+
+MAGIE = b"HUF"
+VERSION = 1
+TAILLE_ENTETE = 13
+
+# code (1 octet) de chaque mode dans l'en-tête
+MODES = {
+    "statique": ord("S"),
+    "classique": ord("C"),
+    "adaptatif": ord("A"),
+    "rans": ord("R"),
+}
+
+
+class ErreurFormat(ValueError):
+    """Données compressées illisibles : en-tête absent, version ou mode inconnu, trame tronquée."""
+
+
+def est_trame(donnees, position=0) -> bool:
+    """
+    Indique si une trame (avec en-tête) commence à la position donnée
+    """
+    return bytes(donnees[position:position + len(MAGIE)]) == MAGIE
+
+
+def ecrire_trame(fichier_sortie, mode, ecrire_donnees):
+    """
+    Écrit une trame complète : l'en-tête est réservé, ecrire_donnees(fichier_sortie) écrit
+    les données du codec, puis leur taille est réécrite dans l'en-tête
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode inconnu : {mode!r} (modes possibles : {', '.join(MODES)})")
+
+    debut = fichier_sortie.tell()
+    fichier_sortie.write(MAGIE + bytes([VERSION, MODES[mode]]) + bytes(8))
+    ecrire_donnees(fichier_sortie)
+    fin = fichier_sortie.tell()
+
+    fichier_sortie.seek(debut + len(MAGIE) + 2)
+    fichier_sortie.write((fin - debut - TAILLE_ENTETE).to_bytes(8, 'big'))
+    fichier_sortie.seek(fin)
+
+
+def lire_entete(donnees, position=0):
+    """
+    Lit l'en-tête de la trame qui commence à `position`
+    Sortie : (mode, début des données du codec, fin des données du codec)
+    """
+    if not est_trame(donnees, position):
+        raise ErreurFormat("en-tête absent : ce ne sont pas des données compressées par ce module")
+    if len(donnees) < position + TAILLE_ENTETE:
+        raise ErreurFormat("en-tête tronqué")
+
+    version = donnees[position + len(MAGIE)]
+    if version != VERSION:
+        raise ErreurFormat(f"version de format non prise en charge : {version}")
+
+    code_mode = donnees[position + len(MAGIE) + 1]
+    for mode, code in MODES.items():
+        if code == code_mode:
+            break
+    else:
+        raise ErreurFormat(f"mode inconnu dans l'en-tête : {code_mode}")
+
+    debut = position + TAILLE_ENTETE
+    fin = debut + int.from_bytes(donnees[position + len(MAGIE) + 2:debut], 'big')
+    if fin > len(donnees):
+        raise ErreurFormat("trame tronquée")
+    return mode, debut, fin
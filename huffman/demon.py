@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Démon de compression local : un seul interpréteur reste chargé et sert des requêtes tramées
+sur une socket Unix ou en TCP local, au lieu de lancer un processus Python par requête.
+
+Les requêtes sont traitées par un groupe de processus « chauds » : les codecs y sont importés
+et les tables fixes (arbre statique, modèle rANS statique) construites une fois pour toutes.
+Une connexion peut enchaîner autant de requêtes qu'elle veut (voir huffman.client).
+
+Requête : opération (1 octet, C ou D), code du mode (1 octet, 0 : auto en compression,
+détection en décompression), taille des options (2 octets), taille des données (4 octets),
+options en JSON, données
+Réponse : statut (1 octet, 0 : succès), taille (4 octets), puis la trame compressée ou le texte
+décompressé en UTF-8, ou le message d'erreur
+
+Une requête de plus de TAILLE_REQUETE_MAX octets (réglable) est lue sans être conservée puis refusée
+par une réponse d'erreur : la connexion reste utilisable.
+
+Lancement : python3 -m huffman.demon --socket /tmp/huffman.sock [--processus P] [--taille-max OCTETS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import struct
+
+from .conteneur import MODES
+
+ENTETE_REQUETE = struct.Struct(">cBHI")
+ENTETE_REPONSE = struct.Struct(">BI")
+
+COMPRESSION = b"C"
+DECOMPRESSION = b"D"
+# code de mode d'une requête sans mode explicite
+SANS_MODE = 0
+
+STATUT_SUCCES = 0
+STATUT_ERREUR = 1
+
+# taille maximale des options et des données d'une requête
+TAILLE_REQUETE_MAX = 1 << 28
+# les octets d'une requête refusée sont lus et jetés par morceaux de cette taille
+TAILLE_MORCEAU = 1 << 16
+
+
+def code_mode(mode) -> int:
+    """
+    Code d'un mode dans une requête ("auto" ou None : SANS_MODE)
+    """
+    if mode in (None, "auto"):
+        return SANS_MODE
+    if mode not in MODES:
+        raise ValueError(f"mode inconnu : {mode!r} (modes possibles : {', '.join(MODES)})")
+    return MODES[mode]
+
+
+def nom_mode(code):
+    """
+    Mode correspondant au code d'une requête, None pour SANS_MODE
+    """
+    if code == SANS_MODE:
+        return None
+    for mode, code_connu in MODES.items():
+        if code_connu == code:
+            return mode
+    raise ValueError(f"mode inconnu dans la requête : {code}")
+
+
+def coder_requete(operation, mode, options, donnees) -> bytes:
+    """
+    Construit une requête tramée
+    Entrée :
+        - operation : COMPRESSION ou DECOMPRESSION
+        - mode : nom du mode, "auto" ou None
+        - options : dictionnaire d'options du codec (sérialisable en JSON)
+        - donnees : texte (str) ou octets
+    """
+    if isinstance(donnees, str):
+        donnees = donnees.encode('utf-8')
+    options = json.dumps(options).encode('utf-8') if options else b""
+    return ENTETE_REQUETE.pack(operation, code_mode(mode), len(options), len(donnees)) + options + bytes(donnees)
+
+
+def prechauffer():
+    """
+    Initialisation d'un processus du groupe : importe les codecs et construit les tables fixes
+    """
+    from . import _codec
+    from .rans import modele_statique
+    from .statique import arbre_statique
+
+    # un Ctrl-C n'interrompt que le démon, qui arrête lui-même son groupe de processus
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for mode in MODES:
+        _codec(mode)
+    arbre_statique()
+    modele_statique().cases
+
+
+def traiter(operation, code, options, donnees) -> bytes:
+    """
+    Exécute une requête dans un processus du groupe et retourne le corps de la réponse
+    """
+    from . import compress, decompress
+
+    mode = nom_mode(code)
+    if operation == COMPRESSION:
+        return compress(donnees, mode or "auto", **options)
+    if operation == DECOMPRESSION:
+        return decompress(donnees, mode, **options).encode('utf-8')
+    raise ValueError(f"opération inconnue : {operation!r}")
+
+
+async def ignorer(lecteur, taille):
+    """
+    Lit et jette `taille` octets, par morceaux de taille bornée
+    """
+    while taille > 0:
+        morceau = await lecteur.readexactly(min(taille, TAILLE_MORCEAU))
+        taille -= len(morceau)
+
+
+async def servir_connexion(lecteur, ecrivain, executeur, taille_max=TAILLE_REQUETE_MAX):
+    """
+    Sert les requêtes d'une connexion, l'une après l'autre, jusqu'à sa fermeture par le client
+    """
+    boucle = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                entete = await lecteur.readexactly(ENTETE_REQUETE.size)
+            except asyncio.IncompleteReadError:
+                return
+            operation, code, taille_options, taille_donnees = ENTETE_REQUETE.unpack(entete)
+
+            try:
+                if taille_options + taille_donnees > taille_max:
+                    # la requête est lue sans être gardée en mémoire, pour rester synchronisé avec le client
+                    await ignorer(lecteur, taille_options + taille_donnees)
+                    raise ValueError(f"requête trop grande : {taille_options + taille_donnees} octets "
+                                     f"(au plus {taille_max})")
+                options = await lecteur.readexactly(taille_options)
+                donnees = await lecteur.readexactly(taille_donnees)
+                options = json.loads(options) if options else {}
+                corps = await boucle.run_in_executor(executeur, traiter, operation, code, options, donnees)
+                # une réponse de 4 Gio ou plus ne tient pas dans l'en-tête : struct.error, renvoyée en erreur
+                reponse = ENTETE_REPONSE.pack(STATUT_SUCCES, len(corps)) + corps
+            except asyncio.IncompleteReadError:
+                raise
+            except Exception as erreur:
+                # l'erreur est renvoyée au client, la connexion reste utilisable
+                corps = f"{type(erreur).__name__} : {erreur}".encode('utf-8')
+                reponse = ENTETE_REPONSE.pack(STATUT_ERREUR, len(corps)) + corps
+            ecrivain.write(reponse)
+            await ecrivain.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        # client parti au milieu d'une requête
+        pass
+    finally:
+        ecrivain.close()
+
+
+async def servir(chemin_socket=None, port=None, hote="127.0.0.1", processus=None, pret=None,
+                 taille_max=TAILLE_REQUETE_MAX, arret=None):
+    """
+    Lance le démon et sert les requêtes jusqu'à son arrêt
+    Entrée :
+        - chemin_socket : socket Unix à créer, ou bien
+        - port : port TCP, sur l'hôte `hote` (local par défaut)
+        - processus : nombre de processus du groupe (par défaut, le nombre de cœurs)
+        - pret : fonction appelée une fois le groupe préchauffé et la socket ouverte
+        - taille_max : taille maximale (options et données) d'une requête, en octets
+        - arret : asyncio.Event qui arrête le démon ; par défaut, SIGINT et SIGTERM
+          (le démon doit alors tourner dans le fil principal)
+    """
+    # Import tardif : multiprocessing n'est utile qu'au démon
+    from concurrent.futures import ProcessPoolExecutor
+
+    processus = processus or os.cpu_count() or 1
+    boucle = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=processus, initializer=prechauffer) as executeur:
+        # démarre tous les processus avant la première requête
+        await asyncio.gather(*(boucle.run_in_executor(executeur, prechauffer) for _ in range(processus)))
+
+        def connexion(lecteur, ecrivain):
+            return servir_connexion(lecteur, ecrivain, executeur, taille_max)
+
+        if chemin_socket is not None:
+            serveur = await asyncio.start_unix_server(connexion, path=chemin_socket)
+        else:
+            serveur = await asyncio.start_server(connexion, host=hote, port=port)
+        if arret is None:
+            # SIGINT et SIGTERM arrêtent proprement le démon, même lancé en arrière-plan
+            arret = asyncio.Event()
+            for numero in (signal.SIGINT, signal.SIGTERM):
+                boucle.add_signal_handler(numero, arret.set)
+        async with serveur:
+            if pret is not None:
+                pret()
+            await arret.wait()
+
+
+def main():
+    analyseur = argparse.ArgumentParser(prog="python3 -m huffman.demon",
+                                        description="Démon de compression Huffman local")
+    adresse = analyseur.add_mutually_exclusive_group(required=True)
+    adresse.add_argument("--socket", metavar="CHEMIN", help="Socket Unix sur laquelle écouter")
+    adresse.add_argument("--port", type=int, help="Port TCP sur lequel écouter (localhost)")
+    analyseur.add_argument("--hote", default="127.0.0.1", help="Adresse d'écoute en TCP")
+    analyseur.add_argument("--processus", metavar="P", type=int, help="Nombre de processus de compression")
+    analyseur.add_argument("--taille-max", metavar="OCTETS", type=int, default=TAILLE_REQUETE_MAX,
+                           help="Taille maximale d'une requête (au-delà, elle est refusée)")
+    arguments = analyseur.parse_args()
+    if arguments.taille_max <= 0:
+        analyseur.error("la taille maximale doit être strictement positive")
+
+    adresse = arguments.socket or f"{arguments.hote}:{arguments.port}"
+    try:
+        asyncio.run(servir(arguments.socket, arguments.port, arguments.hote, arguments.processus,
+                           pret=lambda: print(f"En écoute sur {adresse}", flush=True),
+                           taille_max=arguments.taille_max))
+    finally:
+        if arguments.socket and os.path.exists(arguments.socket):
+            os.remove(arguments.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""rANS : codage entropique par intervalles (range ANS), avec les mêmes modèles de fréquences que Huffman.
+
+Contrairement aux codes de Huffman, un symbole n'est pas limité à un nombre entier de bits : un symbole
+très fréquent (l'espace) coûte moins d'un bit. Le modèle est soit appris sur le texte (compter_frequences,
+comme en mode classique), soit le dictionnaire fixe du mode statique. Les caractères absents du modèle
+sont codés par un symbole d'échappement et écrits en UTF-8 dans un canal séparé.
+
+Le texte est découpé en blocs d'au plus TAILLE_BLOC caractères codés indépendamment. Dans un bloc,
+le symbole i est codé par l'état i % etats : les états entrelacés partagent le même flux d'octets.
+
+Format : modèle (1 octet), nombre d'états (1 octet), table des fréquences si le modèle est appris,
+puis chaque bloc : nombre de symboles, taille du flux rANS, taille du canal d'échappement (entiers
+de taille variable), flux rANS (états initiaux sur 4 octets puis octets de renormalisation),
+caractères échappés en UTF-8.
+"""
+
+import functools
+from itertools import cycle, islice
+
+from .blocs import blocs_texte, ecrire_entier, lire_entier, ouvrir_vue, resultats_en_ordre
+from .classique import compter_frequences
+from .conteneur import ErreurFormat
+
+# Les fréquences normalisées totalisent 2^PRECISION
+PRECISION = 16
+TOTAL = 1 << PRECISION
+MASQUE = TOTAL - 1
+# Les états restent dans [BORNE, 256 * BORNE) : ils tiennent sur 4 octets et sont renormalisés octet par octet
+BORNE = 1 << 23
+# Taille maximale de l'alphabet d'un modèle appris, les symboles les plus rares sont échappés au-delà
+ALPHABET_MAX = TOTAL >> 2
+# Nombre d'états entrelacés par défaut
+ETATS = 4
+
+MODELE_APPRIS = 0
+MODELE_STATIQUE = 1
+MODELES = {"appris": MODELE_APPRIS, "statique": MODELE_STATIQUE}
+# Symbole d'échappement : aucun caractère n'est une chaîne vide
+ECHAPPEMENT = ""
+
+
+def normaliser(frequences):
+    """Ramène des fréquences à un total de TOTAL, dans l'ordre décroissant, chaque symbole gardant au moins 1."""
+    symboles = sorted(frequences, key=lambda symbole: -frequences[symbole])
+    total = sum(frequences.values())
+    normalisees = {symbole: max(1, frequences[symbole] * TOTAL // total) if total else 1 for symbole in symboles}
+
+    ecart = TOTAL - sum(normalisees.values())
+    if ecart > 0:
+        # Les arrondis par défaut profitent au symbole le plus fréquent
+        normalisees[symboles[0]] += ecart
+    while ecart < 0:
+        # Les symboles relevés à 1 sont compensés en retirant sur les plus fréquents
+        for symbole in symboles:
+            if ecart < 0 and normalisees[symbole] > 1:
+                normalisees[symbole] -= 1
+                ecart += 1
+    return normalisees
+
+
+class Modele:
+    """Fréquences normalisées d'un alphabet : intervalles de codage et table de décodage."""
+
+    def __init__(self, frequences):
+        normalisees = normaliser(frequences)
+        self.symboles = list(normalisees)
+        self.indices = {symbole: indice for indice, symbole in enumerate(self.symboles)}
+        self.frequences = list(normalisees.values())
+        self.debuts = []
+        debut = 0
+        for frequence in self.frequences:
+            self.debuts.append(debut)
+            debut += frequence
+        self.echappement = self.indices.get(ECHAPPEMENT)
+        # Codage : (fréquence, début, seuil de renormalisation) de chaque symbole
+        self.codage = [(frequence, debut, ((BORNE >> PRECISION) << 8) * frequence)
+                       for frequence, debut in zip(self.frequences, self.debuts)]
+        self._cases = None
+
+    @property
+    def cases(self):
+        """Table de décodage : (symbole, fréquence, début) du symbole propriétaire de chacune des TOTAL cases."""
+        if self._cases is None:
+            self._cases = []
+            for symbole, frequence, debut in zip(self.symboles, self.frequences, self.debuts):
+                self._cases.extend([(symbole, frequence, debut)] * frequence)
+        return self._cases
+
+    def serialiser(self) -> bytes:
+        """Sérialise la table : nombre de symboles, puis pour chacun ses octets UTF-8 et sa fréquence normalisée."""
+        octets = bytearray(ecrire_entier(len(self.symboles)))
+        for symbole, frequence in zip(self.symboles, self.frequences):
+            encodage = symbole.encode("utf-8")
+            octets += ecrire_entier(len(encodage)) + encodage + ecrire_entier(frequence)
+        return bytes(octets)
+
+    @classmethod
+    def deserialiser(cls, donnees, position):
+        """Relit une table écrite par serialiser, retourne le modèle et la position suivante."""
+        nombre, position = lire_entier(donnees, position)
+        frequences = {}
+        for _ in range(nombre):
+            longueur, position = lire_entier(donnees, position)
+            symbole = bytes(donnees[position:position + longueur]).decode("utf-8")
+            frequences[symbole], position = lire_entier(donnees, position + longueur)
+        # Les fréquences sont déjà normalisées et triées : normaliser les laisse inchangées
+        return cls(frequences), position
+
+
+@functools.lru_cache(maxsize=None)
+def modele_statique():
+    """Construit une seule fois le modèle du dictionnaire fixe du mode statique."""
+    from .statique import freq
+
+    # Les poids sont doublés pour qu'un symbole de poids nul (et l'échappement, comme <inconnu>)
+    # compte pour un demi : sans cela il ne recevrait qu'une case sur TOTAL
+    frequences = {(" " if symbole == "<sp>" else symbole): 2 * frequence or 1 for symbole, frequence in freq.items()}
+    frequences[ECHAPPEMENT] = 1
+    return Modele(frequences)
+
+
+def modele_appris(frequences):
+    """Construit le modèle d'un texte ; au-delà d'ALPHABET_MAX symboles, les plus rares sont échappés."""
+    if len(frequences) < ALPHABET_MAX:
+        return Modele(frequences)
+    gardes = sorted(frequences, key=lambda symbole: -frequences[symbole])[:ALPHABET_MAX - 1]
+    retenues = {symbole: frequences[symbole] for symbole in gardes}
+    retenues[ECHAPPEMENT] = sum(frequences.values()) - sum(retenues.values())
+    return Modele(retenues)
+
+
+def encoder_bloc(symboles, modele, etats=ETATS):
+    """Code une liste d'indices de symboles avec `etats` états rANS entrelacés (le symbole i utilise l'état i % etats)."""
+    codage = modele.codage
+    x = [BORNE] * etats
+    # rANS code à rebours : les octets sont produits à l'envers puis retournés ;
+    # le dernier symbole utilise l'état (len - 1) % etats, puis les états se suivent à l'envers
+    sortie = bytearray()
+    ajouter = sortie.append
+    ordre = islice(cycle(range(etats - 1, -1, -1)), etats - 1 - (len(symboles) - 1) % etats, None)
+    for k, symbole in zip(ordre, reversed(symboles)):
+        frequence, debut, limite = codage[symbole]
+        etat = x[k]
+        while etat >= limite:
+            ajouter(etat & 0xFF)
+            etat >>= 8
+        x[k] = (etat // frequence << PRECISION) + etat % frequence + debut
+    # Les états finaux sont les premiers lus par le décodeur, l'état 0 en tête
+    for k in reversed(range(etats)):
+        sortie += x[k].to_bytes(4, "little")
+    sortie.reverse()
+    return bytes(sortie)
+
+
+def decoder_bloc(donnees, nombre, modele, etats=ETATS):
+    """Décode `nombre` symboles (ECHAPPEMENT pour un caractère échappé) d'un flux produit par encoder_bloc."""
+    cases = modele.cases
+    x = [int.from_bytes(donnees[4 * k:4 * k + 4], "big") for k in range(etats)]
+    position = 4 * etats
+    symboles = []
+    ajouter = symboles.append
+    try:
+        for k in islice(cycle(range(etats)), nombre):
+            etat = x[k]
+            symbole, frequence, debut = cases[etat & MASQUE]
+            etat = frequence * (etat >> PRECISION) + (etat & MASQUE) - debut
+            while etat < BORNE:
+                etat = etat << 8 | donnees[position]
+                position += 1
+            x[k] = etat
+            ajouter(symbole)
+    except IndexError:
+        raise ErreurFormat(f"flux rANS tronqué : {len(symboles)} symboles décodés sur {nombre}") from None
+    # Le décodage remonte exactement le codage : tout le flux est lu et les états reviennent à BORNE
+    if position != len(donnees) or any(etat != BORNE for etat in x):
+        raise ErreurFormat("flux rANS corrompu")
+    return symboles
+
+
+def compresser_bloc(texte, modele, etats=ETATS) -> bytes:
+    """Compresse un bloc de texte : en-tête du bloc, flux rANS et canal d'échappement."""
+    indices = modele.indices
+    echappes = []
+    try:
+        # Cas courant : tous les caractères du bloc sont dans le modèle
+        symboles = list(map(indices.__getitem__, texte))
+    except KeyError:
+        symboles = []
+        for caractere in texte:
+            indice = indices.get(caractere)
+            if indice is None:
+                # Caractère hors modèle : symbole d'échappement, caractère envoyé dans le canal
+                indice = modele.echappement
+                echappes.append(caractere)
+            symboles.append(indice)
+
+    flux = encoder_bloc(symboles, modele, etats)
+    canal = "".join(echappes).encode("utf-8")
+    return ecrire_entier(len(symboles)) + ecrire_entier(len(flux)) + ecrire_entier(len(canal)) + flux + canal
+
+
+def lire_entete_bloc(donnees, position):
+    """Lit l'en-tête d'un bloc, retourne (nombre de symboles, taille du flux, taille du canal, position du flux).
+
+    Lève ErreurFormat si l'en-tête, le flux ou le canal dépasse la fin des données.
+    """
+    try:
+        nombre, position = lire_entier(donnees, position)
+        taille_flux, position = lire_entier(donnees, position)
+        taille_canal, position = lire_entier(donnees, position)
+    except IndexError:
+        raise ErreurFormat("bloc rANS tronqué : en-tête incomplet") from None
+    if position + taille_flux + taille_canal > len(donnees):
+        raise ErreurFormat(f"bloc rANS tronqué : {taille_flux + taille_canal} octets annoncés, "
+                           f"{len(donnees) - position} disponibles")
+    return nombre, taille_flux, taille_canal, position
+
+
+def decompresser_bloc(donnees, position, modele, etats=ETATS):
+    """Décompresse le bloc qui commence à `position`, retourne le texte et la position du bloc suivant."""
+    nombre, taille_flux, taille_canal, position = lire_entete_bloc(donnees, position)
+    fin_flux = position + taille_flux
+    symboles = decoder_bloc(bytes(donnees[position:fin_flux]), nombre, modele, etats)
+
+    try:
+        echappes = bytes(donnees[fin_flux:fin_flux + taille_canal]).decode("utf-8")
+    except UnicodeDecodeError as erreur:
+        raise ErreurFormat(f"canal d'échappement rANS en UTF-8 invalide : {erreur}") from None
+    # Un caractère échappé par symbole d'échappement, ni plus ni moins
+    if len(echappes) != symboles.count(ECHAPPEMENT):
+        raise ErreurFormat(f"canal d'échappement rANS incohérent : {len(echappes)} caractères pour "
+                           f"{symboles.count(ECHAPPEMENT)} échappements")
+    if echappes:
+        echappes = iter(echappes)
+        symboles = [symbole or next(echappes) for symbole in symboles]
+    return "".join(symboles), fin_flux + taille_canal
+
+
+def compresser_flux(fournir_blocs, fichier_sortie, modele="appris", etats=ETATS):
+    """Compresse des blocs de texte dans un fichier binaire (deux passes avec un modèle appris).
+
+    fournir_blocs est appelée une fois par passe et doit retourner un nouvel itérable de blocs.
+    """
+    if modele not in MODELES:
+        raise ValueError(f"modèle inconnu : {modele!r} (modèles possibles : {', '.join(MODELES)})")
+    if not 1 <= etats <= 255:
+        raise ValueError("le nombre d'états doit être compris entre 1 et 255")
+
+    if modele == "statique":
+        table = modele_statique()
+        fichier_sortie.write(bytes([MODELE_STATIQUE, etats]))
+    else:
+        # Première passe : fréquences
+        frequences = {}
+        for bloc in fournir_blocs():
+            compter_frequences(bloc, frequences)
+        if not frequences:
+            # Texte vide : la sortie reste vide
+            return
+        table = modele_appris(frequences)
+        fichier_sortie.write(bytes([MODELE_APPRIS, etats]))
+        fichier_sortie.write(table.serialiser())
+
+    # Seconde passe : un bloc compressé par bloc de texte
+    for bloc in fournir_blocs():
+        fichier_sortie.write(compresser_bloc(bloc, table, etats))
+
+
+def lire_entete(donnees):
+    """Lit le modèle et le nombre d'états, retourne (modèle, états, position du premier bloc)."""
+    if len(donnees) < 2:
+        raise ErreurFormat("en-tête rANS tronqué")
+    if donnees[0] == MODELE_STATIQUE:
+        return modele_statique(), donnees[1], 2
+    if donnees[0] != MODELE_APPRIS:
+        raise ErreurFormat(f"modèle rANS inconnu : {donnees[0]}")
+    try:
+        table, position = Modele.deserialiser(donnees, 2)
+    except (IndexError, UnicodeDecodeError):
+        raise ErreurFormat("table des fréquences rANS tronquée ou corrompue") from None
+    return table, donnees[1], position
+
+
+def lister_blocs(donnees, position):
+    """Retourne la position de début de chaque bloc, en sautant les flux sans les décoder."""
+    positions = []
+    while position < len(donnees):
+        positions.append(position)
+        _, taille_flux, taille_canal, suite = lire_entete_bloc(donnees, position)
+        position = suite + taille_flux + taille_canal
+    return positions
+
+
+def decompresser_bloc_fichier(emplacement, position):
+    """Décompresse un bloc d'un fichier (utilisé par les processus de décompression parallèle)."""
+    with ouvrir_vue(*emplacement) as donnees:
+        table, etats, _ = lire_entete(donnees)
+        return decompresser_bloc(donnees, position, table, etats)[0]
+
+
+def compresser_donnees(donnees, fichier_sortie, modele="appris", etats=ETATS):
+    """Compresse des octets UTF-8 (bytes, mmap ou memoryview) dans un fichier binaire."""
+    compresser_flux(lambda: blocs_texte(donnees), fichier_sortie, modele, etats)
+
+
+def decompresser_donnees(donnees, emplacement=None, processus=1, depuis=0):
+    """Décompresse des octets produits par compresser_donnees, en produisant le texte bloc par bloc.
+
+    Les blocs sont indépendants : ils sont décodés en parallèle si `processus` > 1 et que l'emplacement
+    (chemin, début, fin) des données dans un fichier est connu. `depuis` n'a pas de sens ici et est ignoré.
+    """
+    if len(donnees) == 0:
+        return
+    table, etats, position = lire_entete(donnees)
+
+    if processus > 1 and emplacement is not None:
+        # Import tardif : inutile de charger multiprocessing pour un décodage séquentiel
+        from concurrent.futures import ProcessPoolExecutor
+
+        positions = lister_blocs(donnees, position)
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            # deux blocs en vol par processus : les blocs décodés d'avance ne s'accumulent pas en mémoire
+            yield from resultats_en_ordre(executeur, decompresser_bloc_fichier,
+                                          ((emplacement, debut) for debut in positions), 2 * processus)
+        return
+
+    while position < len(donnees):
+        texte, position = decompresser_bloc(donnees, position, table, etats)
+        yield texte
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Configuration des tests : rend le paquet huffman importable depuis la racine du dépôt
+et fournit les textes et les aides communs aux modules de test."""
+
+import os
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+import huffman  # noqa: E402  (importable une fois la racine dans le chemin)
+from huffman.conteneur import TAILLE_ENTETE  # noqa: E402
+
+with open(os.path.join(RACINE, "le-horla.txt"), encoding="utf-8") as _fichier:
+    HORLA = _fichier.read()
+# extrait court pour le mode adaptatif, dont le coût par symbole est élevé
+EXTRAIT = HORLA[:6000]
+
+
+def aller_retour(texte, mode, **options):
+    """Compresse puis décompresse un texte, vérifie le mode détecté et le texte rendu ; retourne la trame."""
+    donnees = huffman.compress(texte, mode, **options)
+    assert huffman.detecter_mode(donnees) == mode or not texte
+    assert huffman.decompress(donnees) == texte
+    return donnees
+
+
+def premier_octet(donnees):
+    """Premier octet des données du codec, après l'en-tête de la trame."""
+    return donnees[TAILLE_ENTETE]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Trames mises bout à bout et ajout à un fichier compressé, avec ou sans réutilisation de l'arbre."""
+
+import pytest
+
+import huffman
+from conftest import EXTRAIT, HORLA
+from huffman import classique
+from huffman.conteneur import lire_entete
+
+
+def test_trames_concatenees():
+    donnees = b"".join(huffman.compress(morceau, mode) for morceau, mode in
+                       [(HORLA[:3000], "classique"), (HORLA[3000:4000], "rans"),
+                        ("", "statique"), (HORLA[4000:5000], "adaptatif")])
+    assert huffman.decompress(donnees) == HORLA[:5000]
+
+
+def test_ajout_reutilise_arbre(tmp_path):
+    sortie = tmp_path / "journal.huf"
+    lignes = [f"2026-10-19 10:{minute:02d} INFO requête traitée\n" for minute in range(60)]
+    for debut in range(0, len(lignes), 10):
+        morceau = tmp_path / "morceau.txt"
+        morceau.write_text("".join(lignes[debut:debut + 10]), encoding="utf-8")
+        huffman.ajouter_fichier(morceau, sortie, "classique", reutiliser_arbre=True)
+
+    donnees = sortie.read_bytes()
+    assert huffman.decompress(donnees) == "".join(lignes)
+
+    drapeaux = []
+    position = 0
+    while position < len(donnees):
+        _, debut, position = lire_entete(donnees, position)
+        drapeaux.append(donnees[debut] & classique.DRAPEAU_ARBRE_PRECEDENT)
+    # la première trame porte son arbre, les suivantes le réutilisent
+    assert not drapeaux[0] and all(drapeaux[1:])
+
+
+def test_ajout_nouveaux_symboles(tmp_path):
+    sortie, morceau = tmp_path / "journal.huf", tmp_path / "morceau.txt"
+    for texte in ["abcabc", "xyz", "abc"]:
+        morceau.write_text(texte, encoding="utf-8")
+        huffman.ajouter_fichier(morceau, sortie, "classique", reutiliser_arbre=True)
+    assert huffman.decompress(sortie.read_bytes()) == "abcabcxyzabc"
+
+
+def test_ajout_echoue(tmp_path):
+    sortie, morceau = tmp_path / "journal.huf", tmp_path / "morceau.txt"
+    morceau.write_text(EXTRAIT[:1000], encoding="utf-8")
+    huffman.ajouter_fichier(morceau, sortie, "classique")
+    avant = sortie.read_bytes()
+
+    # UTF-8 invalide au milieu du texte : la compression échoue après avoir écrit une partie de la trame
+    morceau.write_bytes(EXTRAIT[:2000].encode("utf-8") + b"\xff" + EXTRAIT[:100].encode("utf-8"))
+    with pytest.raises(UnicodeDecodeError):
+        huffman.ajouter_fichier(morceau, sortie, "adaptatif")
+    assert sortie.read_bytes() == avant
+    assert huffman.decompress(avant) == EXTRAIT[:1000]
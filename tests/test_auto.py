@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Choix automatique du mode."""
+
+import time
+
+import huffman
+from conftest import HORLA
+
+
+def test_auto():
+    # le choix dépend de mesures de temps : on vérifie la forme de la décision et l'aller-retour
+    decision = huffman.choisir_mode(HORLA)
+    assert decision["mode"] in huffman.MODES
+    assert set(decision["estimations"]) == set(huffman.MODES)
+    donnees = huffman.compress(HORLA, "auto")
+    assert huffman.detecter_mode(donnees) in huffman.MODES
+    assert huffman.decompress(donnees) == HORLA
+
+
+def test_auto_grand_alphabet():
+    # la sonde de l'adaptatif est bornée dans le temps, et son temps estimé croît avec l'alphabet :
+    # sans budget, il n'est pas retenu pour un texte long sur un grand alphabet
+    texte = "".join(chr(0x4E00 + (i * i) % 3000) for i in range(200_000))
+    debut = time.perf_counter()
+    decision = huffman.choisir_mode(texte)
+    assert time.perf_counter() - debut < 10
+    assert decision["budget_par_defaut"] and decision["mode"] != "adaptatif"
+    assert decision["estimations"]["adaptatif"]["temps"] > decision["budget"]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Bibliothèque commune : allers-retours de tous les modes, anciens fichiers sans en-tête, erreurs de format."""
+
+import pytest
+
+import huffman
+from conftest import EXTRAIT, HORLA, aller_retour
+from huffman import adaptatif
+from huffman.conteneur import TAILLE_ENTETE
+
+CAS_LIMITES = ["", "a", "aaaa", "é😀\n" * 50, "Ωmega ∑ " + "x" * 300]
+
+
+@pytest.mark.parametrize("mode", ["statique", "classique", "adaptatif", "rans"])
+@pytest.mark.parametrize("texte", CAS_LIMITES)
+def test_cas_limites(mode, texte):
+    aller_retour(texte, mode)
+
+
+def test_ancien_fichier_sans_entete():
+    sortie = huffman.compress(HORLA[:2000], "classique")
+    assert huffman.decompress(sortie[TAILLE_ENTETE:], mode="classique") == HORLA[:2000]
+    with pytest.raises(huffman.ErreurFormat):
+        huffman.decompress(sortie[TAILLE_ENTETE:])
+
+
+@pytest.mark.parametrize("texte, coupe", [(EXTRAIT, 7), (EXTRAIT, 40), ("é", 1)])
+def test_adaptatif_tronque(texte, coupe):
+    # données du codec sans l'en-tête de trame, qui détecterait lui-même la troncature
+    donnees = huffman.compress(texte, "adaptatif")[TAILLE_ENTETE:]
+    with pytest.raises(huffman.ErreurFormat):
+        "".join(adaptatif.decompresser_donnees(donnees[:-coupe]))
+
+
+def test_adaptatif_depuis_sans_points_de_reprise():
+    donnees = huffman.compress(EXTRAIT, "adaptatif")
+    with pytest.warns(UserWarning, match="points de reprise"):
+        assert huffman.decompress(donnees, depuis=2) == EXTRAIT
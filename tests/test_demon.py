@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Démon de compression et son client, servis dans un fil d'exécution sur une socket Unix temporaire."""
+
+import asyncio
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import HORLA
+from huffman import demon
+from huffman.client import Client, ErreurDemon, lire_exactement
+
+TAILLE_MAX = 1 << 20
+
+
+@pytest.fixture(scope="module")
+def chemin_socket(tmp_path_factory):
+    """Lance servir() avec deux processus pour tous les tests du module, et l'arrête à la fin."""
+    chemin = str(tmp_path_factory.mktemp("demon") / "huffman.sock")
+    boucle = asyncio.new_event_loop()
+    arret = asyncio.Event()
+    pret = threading.Event()
+    fil = threading.Thread(target=boucle.run_until_complete,
+                           args=(demon.servir(chemin, processus=2, pret=pret.set, taille_max=TAILLE_MAX,
+                                              arret=arret),))
+    fil.start()
+    assert pret.wait(60), "le démon n'a pas démarré"
+    yield chemin
+    boucle.call_soon_threadsafe(arret.set)
+    fil.join(60)
+    boucle.close()
+
+
+def requete_brute(connexion, requete):
+    """Envoie une requête tramée sur une socket et retourne (statut, corps) de la réponse."""
+    connexion.sendall(requete)
+    statut, taille = demon.ENTETE_REPONSE.unpack(lire_exactement(connexion, demon.ENTETE_REPONSE.size))
+    return statut, lire_exactement(connexion, taille)
+
+
+@pytest.mark.parametrize("mode", ["statique", "classique", "adaptatif", "rans", "auto"])
+def test_aller_retour(chemin_socket, mode):
+    texte = HORLA[:3000]
+    with Client(chemin_socket) as client:
+        trame = client.compress(texte, mode)
+        assert client.decompress(trame) == texte
+
+
+def test_erreur_connexion_reutilisable(chemin_socket):
+    # une seule connexion : la requête qui suit l'erreur passe par la même
+    with Client(chemin_socket, connexions=1) as client:
+        with pytest.raises(ErreurDemon, match="ErreurFormat"):
+            client.decompress(b"pas une trame")
+        with pytest.raises(ErreurDemon):
+            client.compress("texte", "classique", option_inconnue=1)
+        assert client.decompress(client.compress("après l'erreur")) == "après l'erreur"
+
+
+def test_mode_inconnu(chemin_socket):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connexion:
+        connexion.connect(chemin_socket)
+        requete = demon.ENTETE_REQUETE.pack(demon.COMPRESSION, 99, 0, 5) + b"texte"
+        statut, corps = requete_brute(connexion, requete)
+        assert statut == demon.STATUT_ERREUR and b"mode inconnu" in corps
+
+        statut, corps = requete_brute(connexion, demon.coder_requete(demon.COMPRESSION, "classique", {}, "texte"))
+        assert statut == demon.STATUT_SUCCES
+
+
+def test_requete_trop_grande(chemin_socket):
+    with Client(chemin_socket, connexions=1) as client:
+        with pytest.raises(ErreurDemon, match="trop grande"):
+            client.compress("x" * (TAILLE_MAX + 1), "classique")
+        assert client.decompress(client.compress("suite")) == "suite"
+
+
+def test_clients_simultanes(chemin_socket):
+    textes = [HORLA[i * 500:(i + 1) * 500] for i in range(32)]
+    with Client(chemin_socket, connexions=4) as client:
+        def aller_retour(texte):
+            return client.decompress(client.compress(texte, "classique"))
+
+        with ThreadPoolExecutor(max_workers=8) as fils:
+            assert list(fils.map(aller_retour, textes)) == textes
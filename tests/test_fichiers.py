@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Fichiers lus par mmap et écrits par blocs : sortie identique à l'entrée, erreurs en cours d'écriture."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import huffman
+from conftest import HORLA, RACINE
+
+
+@pytest.mark.parametrize("mode", ["statique", "classique", "rans"])
+def test_sortie_identique_a_entree(tmp_path, mode):
+    chemin = tmp_path / "texte.txt"
+    chemin.write_text(HORLA, encoding="utf-8")
+    huffman.compresser_fichier(chemin, chemin, mode)
+    assert huffman.detecter_mode(chemin.read_bytes()) == mode
+    huffman.decompresser_fichier(chemin, chemin)
+    assert chemin.read_text(encoding="utf-8") == HORLA
+
+
+def test_sortie_identique_a_entree_ligne_de_commande(tmp_path):
+    chemin = tmp_path / "texte.txt"
+    chemin.write_text(HORLA, encoding="utf-8")
+    environnement = dict(os.environ, PYTHONPATH=RACINE)
+    for action in ("-e", "-d"):
+        subprocess.run([sys.executable, "-m", "huffman", action, str(chemin), "-o", str(chemin)],
+                       check=True, stdout=subprocess.DEVNULL, env=environnement)
+    assert chemin.read_text(encoding="utf-8") == HORLA
+
+
+def test_erreur_laisse_la_sortie_intacte(tmp_path):
+    entree, sortie = tmp_path / "entree.txt", tmp_path / "sortie.huf"
+    sortie.write_bytes(b"ancien contenu")
+    entree.write_bytes(HORLA[:1000].encode("utf-8") + b"\xff")
+    with pytest.raises(UnicodeDecodeError):
+        huffman.compresser_fichier(entree, sortie, "classique")
+    assert sortie.read_bytes() == b"ancien contenu"
+    assert sorted(os.listdir(tmp_path)) == ["entree.txt", "sortie.huf"]
+
+
+def test_ajout_a_lui_meme(tmp_path):
+    chemin = tmp_path / "journal.huf"
+    chemin.write_bytes(huffman.compress(HORLA[:1000]))
+    with pytest.raises(ValueError):
+        huffman.ajouter_fichier(chemin, chemin)
+    assert huffman.decompress(chemin.read_bytes()) == HORLA[:1000]
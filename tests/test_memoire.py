@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Plafond de mémoire de la compression et de la décompression de fichiers
+
+Chaque mode compresse puis décompresse un fichier généré de plusieurs Mo dans un processus à part ;
+le pic de mémoire de ce processus (VmHWM, à défaut ru_maxrss) et celui de chacun des processus de
+décompression parallèle qu'il lance (ru_maxrss des enfants) doivent rester sous un plafond fixe,
+bien inférieur à ce que coûterait une copie complète du texte et de ses bits. Le mode adaptatif, dont le coût par symbole est bien
+plus élevé, travaille sur un fichier plus petit pour garder un temps d'exécution raisonnable.
+"""
+
+import filecmp
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from conftest import RACINE
+
+# pic de mémoire maximal d'un processus (en Kio, unité de VmHWM et de ru_maxrss sous Linux)
+PLAFOND = 40 * 1024
+TAILLE_FICHIER = 8 * 1024 * 1024
+TAILLE_FICHIER_ADAPTATIF = 256 * 1024
+
+MOTS = ["le", "horla", "une", "nuit", "je", "suis", "malade", "maison", "rivière", "été", "soir", "trois-mâts"]
+
+SCRIPT = """
+import resource, sys
+import huffman
+
+entree, compresse, sortie, mode = sys.argv[1:5]
+options = dict(option.split("=") for option in sys.argv[5:])
+options = {nom: int(valeur) for nom, valeur in options.items()}
+processus = options.pop("processus", 1)
+huffman.compresser_fichier(entree, compresse, mode, **options)
+huffman.decompresser_fichier(compresse, sortie, processus=processus)
+# ru_maxrss garde le pic du processus avant exec (ici pytest) ; VmHWM ne compte que ce processus-ci
+with open("/proc/self/status") as statut:
+    pics = [int(ligne.split()[1]) for ligne in statut if ligne.startswith("VmHWM:")]
+# Les processus de décompression sont terminés et attendus : RUSAGE_CHILDREN donne le pic du plus gros
+enfants = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(pics[0] if pics else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, enfants)
+"""
+
+
+def generer_texte(chemin, taille):
+    """Écrit un texte pseudo-aléatoire d'environ `taille` octets, par lignes."""
+    generateur = random.Random(taille)
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        ecrits = 0
+        while ecrits < taille:
+            ligne = " ".join(generateur.choice(MOTS) for _ in range(12)) + ".\n"
+            ecrits += fichier.write(ligne)
+
+
+def pic_memoire(dossier, mode, taille, **options):
+    """Compresse et décompresse un fichier généré dans un processus à part.
+
+    Retourne le pic de mémoire de ce processus et le plus grand pic de ses processus enfants (0 sans enfant).
+    """
+    entree = os.path.join(dossier, "entree.txt")
+    compresse = os.path.join(dossier, "entree.huf")
+    sortie = os.path.join(dossier, "sortie.txt")
+    generer_texte(entree, taille)
+
+    environnement = dict(os.environ, PYTHONPATH=RACINE)
+    resultat = subprocess.run([sys.executable, "-c", SCRIPT, entree, compresse, sortie, mode]
+                              + [f"{nom}={valeur}" for nom, valeur in options.items()],
+                              capture_output=True, text=True, env=environnement, check=True)
+    assert filecmp.cmp(entree, sortie, shallow=False)
+    pic, pic_enfants = map(int, resultat.stdout.split()[-2:])
+    return pic, pic_enfants
+
+
+@pytest.mark.parametrize("mode", ["statique", "classique", "rans"])
+def test_plafond_memoire(tmp_path, mode):
+    assert max(pic_memoire(tmp_path, mode, TAILLE_FICHIER)) < PLAFOND
+
+
+def test_plafond_memoire_adaptatif(tmp_path):
+    assert max(pic_memoire(tmp_path, "adaptatif", TAILLE_FICHIER_ADAPTATIF)) < PLAFOND
+
+
+def test_plafond_memoire_multi_flux(tmp_path):
+    assert max(pic_memoire(tmp_path, "classique", TAILLE_FICHIER, flux=4)) < PLAFOND
+
+
+def test_plafond_memoire_multi_flux_parallele(tmp_path):
+    pic, pic_enfants = pic_memoire(tmp_path, "classique", TAILLE_FICHIER, flux=4, processus=4)
+    # les sous-flux sont décodés dans les processus enfants : ils doivent avoir été mesurés
+    assert 0 < pic_enfants < PLAFOND
+    assert pic < PLAFOND
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Mode mots du codec classique : allers-retours avec et sans seuil de fréquence."""
+
+import pytest
+
+from conftest import HORLA, aller_retour
+
+
+@pytest.mark.parametrize("options", [{}, {"mots": True}, {"mots": True, "seuil": 5}])
+def test_classique(options):
+    aller_retour(HORLA, "classique", **options)
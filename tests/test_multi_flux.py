@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Sous-flux entrelacés du codec classique : allers-retours et décodage parallèle."""
+
+import pytest
+
+import huffman
+from conftest import HORLA, aller_retour, premier_octet
+from huffman import classique
+
+
+@pytest.mark.parametrize("mots", [False, True])
+@pytest.mark.parametrize("flux", [2, 3, 7])
+def test_classique_multi_flux(mots, flux):
+    donnees = aller_retour(HORLA, "classique", mots=mots, flux=flux)
+    assert premier_octet(donnees) & classique.DRAPEAU_MULTI_FLUX
+
+
+def test_classique_multi_flux_parallele(tmp_path):
+    entree, sortie, texte = tmp_path / "entree.txt", tmp_path / "sortie.txt", tmp_path / "texte.txt"
+    entree.write_text(HORLA, encoding="utf-8")
+    huffman.compresser_fichier(entree, sortie, "classique", flux=3)
+    huffman.decompresser_fichier(sortie, texte, processus=2)
+    assert texte.read_text(encoding="utf-8") == HORLA
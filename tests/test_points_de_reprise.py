@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Points de reprise du codec adaptatif : reprise à un segment et décodage parallèle."""
+
+import random
+
+import huffman
+from conftest import EXTRAIT, aller_retour, premier_octet
+from huffman import adaptatif
+
+
+def test_adaptatif_points_de_reprise(tmp_path):
+    donnees = aller_retour(EXTRAIT, "adaptatif", intervalle=1000)
+    assert premier_octet(donnees) & adaptatif.DRAPEAU_POINTS_DE_REPRISE
+
+    # reprise au troisième segment : le texte à partir du 2000e caractère
+    assert huffman.decompress(donnees, depuis=2) == EXTRAIT[2000:]
+
+    chemin, texte = tmp_path / "extrait.huf", tmp_path / "extrait.txt"
+    chemin.write_bytes(donnees)
+    huffman.decompresser_fichier(chemin, texte, processus=2)
+    assert texte.read_text(encoding="utf-8") == EXTRAIT
+
+
+def test_points_de_reprise_grand_alphabet(tmp_path):
+    # au-delà d'environ 250 symboles, un nœud reçoit le numéro 512 du NYT initial (rangé sous la clé 1000) :
+    # l'index des numéros ne reflète plus l'arbre, l'instantané doit le restituer tel quel
+    generateur = random.Random(392)
+    alphabet = [chr(0x4E00 + i) for i in range(392)]
+    texte = "".join(generateur.choice(alphabet) for _ in range(6000))
+    donnees = aller_retour(texte, "adaptatif", intervalle=1000)
+    for depuis in range(1, 6):
+        assert huffman.decompress(donnees, depuis=depuis) == texte[1000 * depuis:]
+
+    chemin, sortie = tmp_path / "grand.huf", tmp_path / "grand.txt"
+    chemin.write_bytes(donnees)
+    huffman.decompresser_fichier(chemin, sortie, processus=2)
+    assert sortie.read_text(encoding="utf-8") == texte
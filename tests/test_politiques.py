@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Politiques d'oubli du codec adaptatif : division des poids et réinitialisation du modèle."""
+
+import pytest
+
+import huffman
+from conftest import EXTRAIT, aller_retour
+from huffman import adaptatif
+from huffman.conteneur import TAILLE_ENTETE
+
+
+@pytest.mark.parametrize("politique, parametre", [
+    (adaptatif.POLITIQUE_DIVISION, 256),
+    (adaptatif.POLITIQUE_DIVISION, 1),  # seuil inférieur au nombre de symboles
+    (adaptatif.POLITIQUE_REINITIALISATION, 1000),
+])
+def test_adaptatif_politiques(politique, parametre):
+    donnees = aller_retour(EXTRAIT, "adaptatif", politique=politique, parametre=parametre)
+    assert adaptatif.lire_entete(donnees[TAILLE_ENTETE:])[:2] == (politique, parametre)
+
+
+def test_adaptatif_division_seuil_bas(monkeypatch):
+    # un seuil trop bas ne doit pas reconstruire l'arbre après chaque symbole
+    divisions = []
+    diviser_poids = adaptatif.ArbreHuffman.diviser_poids
+    monkeypatch.setattr(adaptatif.ArbreHuffman, "diviser_poids",
+                        lambda arbre: divisions.append(1) or diviser_poids(arbre))
+    huffman.compress(EXTRAIT, "adaptatif", politique=adaptatif.POLITIQUE_DIVISION, parametre=1)
+    assert len(divisions) < len(EXTRAIT) // 10
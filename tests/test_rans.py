@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Codec rANS : modèles, nombre d'états, échappements, décodage parallèle et erreurs de format."""
+
+import pytest
+
+import huffman
+from conftest import HORLA, aller_retour, premier_octet
+from huffman import rans
+from huffman.conteneur import TAILLE_ENTETE
+
+
+@pytest.mark.parametrize("modele", ["appris", "statique"])
+@pytest.mark.parametrize("etats", [1, 4, 7])
+def test_rans(modele, etats):
+    donnees = aller_retour(HORLA, "rans", modele=modele, etats=etats)
+    assert premier_octet(donnees) == rans.MODELES[modele]
+
+
+def test_rans_echappements():
+    # alphabet plus grand qu'ALPHABET_MAX : les caractères les plus rares passent par le canal d'échappement
+    texte = "".join(chr(0x4E00 + i) for i in range(rans.ALPHABET_MAX + 100)) * 2
+    aller_retour(texte, "rans")
+
+
+def test_rans_modele_inconnu():
+    donnees = bytearray(huffman.compress(HORLA[:1000], "rans"))
+    donnees[TAILLE_ENTETE] = 0x7F
+    with pytest.raises(huffman.ErreurFormat):
+        huffman.decompress(bytes(donnees))
+
+
+def test_rans_blocs_paralleles(tmp_path):
+    entree, sortie, texte = tmp_path / "entree.txt", tmp_path / "sortie.huf", tmp_path / "texte.txt"
+    entree.write_text(HORLA * 3, encoding="utf-8")
+    huffman.compresser_fichier(entree, sortie, "rans")
+    huffman.decompresser_fichier(sortie, texte, processus=2)
+    assert texte.read_text(encoding="utf-8") == HORLA * 3
+
+
+@pytest.mark.parametrize("modele", ["appris", "statique"])
+@pytest.mark.parametrize("coupe", [1, 2, 5, 40, 500])
+def test_rans_tronque(modele, coupe):
+    # avec le modèle statique, les caractères hors dictionnaire remplissent le canal d'échappement,
+    # dernier élément du bloc : les petites coupes l'entament
+    texte = HORLA[:3000] + "€œ✓" * 50
+    donnees = huffman.compress(texte, "rans", modele=modele)[TAILLE_ENTETE:]
+    with pytest.raises(huffman.ErreurFormat):
+        "".join(rans.decompresser_donnees(donnees[:-coupe]))